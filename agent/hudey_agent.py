@@ -221,15 +221,19 @@ class HudeyAgent:
                     requires_approval=False,
                     reasoning="Collect creator responses from webhooks/disk.",
                 )
-            responded = [
-                cid for cid, eng in context.engagements.items()
-                if (hasattr(eng, "status") and eng.status == EngagementStatus.RESPONDED)
-                or (isinstance(eng, dict) and eng.get("status") == "responded")
-            ]
-            if responded:
+            # Only the first responder is needed — stop scanning once found.
+            responded_id = next(
+                (
+                    cid for cid, eng in context.engagements.items()
+                    if (hasattr(eng, "status") and eng.status == EngagementStatus.RESPONDED)
+                    or (isinstance(eng, dict) and eng.get("status") == "responded")
+                ),
+                None,
+            )
+            if responded_id is not None:
                 return AgentAction(
                     type=AgentActionType.NEGOTIATE_TERMS,
-                    input={"creator_id": responded[0]},
+                    input={"creator_id": responded_id},
                     requires_approval=False,
                     reasoning="Compose counter offer for responding creator.",
                 )
@@ -307,7 +311,7 @@ class HudeyAgent:
             strategy = self.generate_strategy(context.brief)
             return ToolResult(
                 success=True,
-                output={"strategy": strategy.model_dump()},
+                output={"strategy": strategy.model_dump(), "_trusted": True},
             )
 
         if action.type == AgentActionType.COMPLETE:
@@ -331,7 +335,10 @@ class HudeyAgent:
         approve_all: bool = False,
         on_step: callable = None,
     ) -> CampaignContext:
-        """Run the full campaign loop: reason -> approve (if needed) -> execute -> update -> learn."""
+        """Run the full campaign loop: reason -> approve (if needed) -> execute -> update -> learn.
+
+        Returns the context early, not complete, if an approval times out.
+        """
         context = CampaignContext.from_brief(brief)
 
         while not context.is_complete:
@@ -342,6 +349,15 @@ class HudeyAgent:
                 if on_step:
                     on_step(context)
                 result = self.execute_action(next_action, context, approve_all)
+                if not result.success:
+                    # No decision was recorded (e.g. the approval couldn't be
+                    # created), so re-asking would spin; let the caller retry.
+                    raise RuntimeError(f"Approval request failed: {result.error}")
+                if result.output.get("timed_out"):
+                    # Nobody decided; stop here rather than ask again. The
+                    # context is left incomplete for the caller to act on.
+                    self.update_memory(context, result)
+                    break
                 context.update(result)
                 if on_step:
                     on_step(context)
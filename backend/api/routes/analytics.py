@@ -3,14 +3,26 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from fastapi import APIRouter, Depends
 
 from backend.auth.current_brand import get_current_brand
+from backend.cache import dashboard_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
+_EMPTY_EMAIL_SUMMARY = {"total_sent": 0, "delivered": 0, "opened": 0, "clicked": 0, "bounced": 0, "per_creator": []}
+
+
+def _result_or_empty(future: Future) -> dict:
+    try:
+        return future.result()
+    except Exception as e:
+        logger.warning("analytics: batch fetch failed: %s", e)
+        return {}
+
 
 @router.get("/dashboard")
 def analytics_dashboard(brand: dict = Depends(get_current_brand)):
@@ -20,13 +32,36 @@ def analytics_dashboard(brand: dict = Depends(get_current_brand)):
     email + engagements + campaign detail + monitor) with a single
     backend query that aggregates everything server-side.
     """
-    from backend.db.repositories.campaign_repo import list_campaigns, get_campaign
-    from backend.db.repositories.email_event_repo import get_delivery_summary
-    from backend.db.repositories.engagement_repo import get_engagements
-    from backend.db.repositories.monitor_repo import get_monitor_summary
+    from backend.db.repositories.campaign_repo import list_campaigns
+    from backend.db.repositories.email_event_repo import get_delivery_counts_batch
+    from backend.db.repositories.engagement_repo import get_engagements_batch
+    from backend.db.repositories.monitor_repo import get_monitor_summary_batch
 
     brand_id = brand["id"]
-    campaigns = list_campaigns(brand_id=brand_id)
+    cached = dashboard_cache.get(brand_id)
+    if cached is not None:
+        return cached
+
+    # Briefs (for budgets) come back with the list itself.
+    campaigns = list_campaigns(brand_id=brand_id, include_brief=True)
+
+    # One query per source for all campaigns (instead of 3 per campaign),
+    # run concurrently. A failed batch degrades to empty data for every
+    # campaign.
+    campaign_ids = [c["id"] for c in campaigns]
+    email_by_cid: dict = {}
+    engagements_by_cid: dict = {}
+    monitor_by_cid: dict = {}
+    if campaign_ids:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = (
+                pool.submit(get_delivery_counts_batch, campaign_ids),
+                pool.submit(get_engagements_batch, campaign_ids),
+                pool.submit(get_monitor_summary_batch, campaign_ids),
+            )
+        email_by_cid, engagements_by_cid, monitor_by_cid = (
+            _result_or_empty(f) for f in futures
+        )
 
     # Aggregation accumulators
     by_status: dict[str, int] = {}
@@ -71,26 +106,9 @@ def analytics_dashboard(brand: dict = Depends(get_current_brand)):
 
         by_status[cstatus] = by_status.get(cstatus, 0) + 1
 
-        # Fetch per-campaign data (server-side, no network overhead)
-        try:
-            email = get_delivery_summary(cid)
-        except Exception:
-            email = {"total_sent": 0, "delivered": 0, "opened": 0, "clicked": 0, "bounced": 0, "per_creator": []}
-
-        try:
-            engagements = get_engagements(cid)
-        except Exception:
-            engagements = []
-
-        try:
-            campaign_detail = get_campaign(cid, brand_id=brand_id)
-        except Exception:
-            campaign_detail = None
-
-        try:
-            monitor = get_monitor_summary(cid)
-        except Exception:
-            monitor = {}
+        email = email_by_cid.get(cid) or _EMPTY_EMAIL_SUMMARY
+        engagements = engagements_by_cid.get(cid) or []
+        monitor = monitor_by_cid.get(cid) or {}
 
         # Email totals
         total_sent += email.get("total_sent", 0)
@@ -220,9 +238,9 @@ def analytics_dashboard(brand: dict = Depends(get_current_brand)):
         })
 
         # Budget tracking
-        brief = {}
-        if campaign_detail and isinstance(campaign_detail.get("brief"), dict):
-            brief = campaign_detail["brief"]
+        brief = c.get("brief")
+        if not isinstance(brief, dict):
+            brief = {}
         budget = brief.get("budget_gbp", 0)
         if not isinstance(budget, (int, float)):
             budget = 0
@@ -277,7 +295,7 @@ def analytics_dashboard(brand: dict = Depends(get_current_brand)):
 
     total_eng_all = cp_total_likes + cp_total_comments + cp_total_shares + cp_total_saves
 
-    return {
+    result = {
         "totalCampaigns": len(campaigns),
         "byStatus": by_status,
         "totalCreatorsContacted": total_contacted,
@@ -319,3 +337,5 @@ def analytics_dashboard(brand: dict = Depends(get_current_brand)):
             "perCampaign": budget_per_campaign,
         },
     }
+    dashboard_cache.set(brand_id, result)
+    return result
@@ -8,7 +8,7 @@ from backend.auth.current_brand import get_current_brand
 from backend.db.repositories.approval_repo import (
     create_approval as repo_create,
     list_approvals as repo_list,
-    list_pending as repo_pending,
+    list_pending_for_brand as repo_pending_for_brand,
     decide_approval as repo_decide,
 )
 from backend.db.repositories.campaign_repo import get_campaign as repo_get_campaign
@@ -22,12 +22,7 @@ router = APIRouter(tags=["approvals"])
 @router.get("/api/approvals/pending")
 def pending_approvals(brand: dict = Depends(get_current_brand)):
     """List all pending approvals for the authenticated user's brand."""
-    all_pending = repo_pending()
-    brand_id = brand["id"]
-    return [
-        a for a in all_pending
-        if _approval_belongs_to_brand(a, brand_id)
-    ]
+    return repo_pending_for_brand(brand["id"])
 
 
 @router.get("/api/campaigns/{campaign_id}/approvals")
@@ -74,15 +69,6 @@ def decide_approval(request: Request, approval_id: str, body: DecideApprovalRequ
     return {"ok": True}
 
 
-def _approval_belongs_to_brand(approval: dict, brand_id: str) -> bool:
-    """Check if an approval's campaign belongs to the given brand."""
-    campaign_id = approval.get("campaign_id")
-    if not campaign_id:
-        return False
-    campaign = repo_get_campaign(campaign_id)
-    return campaign is not None and campaign.get("brand_id") == brand_id
-
-
 # ── Creator response webhooks (unauthenticated) ──────────────
 
 
@@ -27,6 +27,8 @@ from backend.db.repositories.campaign_repo import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
 
+_ACTIVE_JOB_STATUSES = frozenset({"queued", "running"})
+
 
 @router.get("/")
 @router.get("")
@@ -106,7 +108,7 @@ def run_campaign(campaign_id: str, brand: dict = Depends(get_current_brand)):
     from backend.db.repositories.job_repo import enqueue, get_job_for_campaign
 
     existing_job = get_job_for_campaign(campaign["id"])
-    if existing_job and existing_job["status"] in ("queued", "running"):
+    if existing_job and existing_job["status"] in _ACTIVE_JOB_STATUSES:
         raise HTTPException(status_code=409, detail="Campaign already queued or running")
 
     # Enqueue first, then mark as running (avoids stuck "running" state if enqueue fails)
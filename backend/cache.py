@@ -103,3 +103,14 @@ search_cache = TTLCache(default_ttl=3600, max_size=200)
 # Creator content/posts: 2 hour TTL, 500 slots
 # Posts are fairly stable; avoids hammering InsightIQ per profile view
 content_cache = TTLCache(default_ttl=7200, max_size=500)
+
+# Analytics dashboard aggregate per brand: 15s TTL, 256 slots
+# The frontend polls it; short TTL absorbs the polling without going stale
+dashboard_cache = TTLCache(default_ttl=15, max_size=256)
+
+# Raw InsightIQ GETs (PhylloClient._get): 5 min TTL, 1024 slots
+insightiq_get_cache = TTLCache(default_ttl=300, max_size=1024)
+
+# Finished InsightIQ analysis jobs: 1 hour TTL, 1024 slots
+# A COMPLETED brand-fit / purchase-intent / relevance result never changes
+insightiq_job_cache = TTLCache(default_ttl=3600, max_size=1024)
@@ -25,3 +25,24 @@ def reset_supabase():
     """Force re-creation of the Supabase client (e.g. after a connection error)."""
     global _SUPABASE_CLIENT
     _SUPABASE_CLIENT = None
+
+
+# PostgREST caps every response at max-rows (1000 on Supabase by default)
+# without signalling truncation, so keep pages at or below that.
+PAGE_SIZE = 1000
+
+
+def select_all(build_query, page_size: int = PAGE_SIZE) -> list:
+    """Run a select page by page with .range() and return every row.
+
+    build_query() must return a fresh, deterministically ordered query
+    (filters and order applied, not yet executed) on each call.
+    """
+    rows: list = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
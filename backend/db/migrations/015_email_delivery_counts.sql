@@ -0,0 +1,42 @@
+-- Migration 015: Per-campaign email delivery counts in one GROUP BY
+-- Run this in Supabase SQL Editor (Dashboard → SQL Editor → New query)
+--
+-- The analytics dashboard only needs sent/delivered/opened/clicked/bounced
+-- counts per campaign. Aggregating in Postgres returns one row per campaign
+-- instead of shipping every email event to the API.
+--
+-- Counts match email_event_repo._summarize_events: one recipient per
+-- creator_id (email_id when creator_id is empty), and each recipient counts
+-- once per event type it has seen.
+
+CREATE INDEX IF NOT EXISTS idx_email_events_campaign ON email_events(campaign_id);
+
+-- email_events.campaign_id may be text — compare as text.
+CREATE OR REPLACE FUNCTION email_delivery_counts(p_campaign_ids TEXT[])
+RETURNS TABLE (
+    campaign_id TEXT,
+    total_sent BIGINT,
+    delivered BIGINT,
+    opened BIGINT,
+    clicked BIGINT,
+    bounced BIGINT
+) AS $$
+    SELECT r.campaign_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE r.delivered),
+           COUNT(*) FILTER (WHERE r.opened),
+           COUNT(*) FILTER (WHERE r.clicked),
+           COUNT(*) FILTER (WHERE r.bounced)
+    FROM (
+        SELECT e.campaign_id::text AS campaign_id,
+               COALESCE(NULLIF(e.creator_id, ''), e.email_id, '') AS recipient_key,
+               bool_or(e.event_type = 'delivered') AS delivered,
+               bool_or(e.event_type = 'opened') AS opened,
+               bool_or(e.event_type = 'clicked') AS clicked,
+               bool_or(e.event_type = 'bounced') AS bounced
+        FROM email_events e
+        WHERE e.campaign_id::text = ANY(p_campaign_ids)
+        GROUP BY 1, 2
+    ) r
+    GROUP BY r.campaign_id;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,31 @@
+-- Migration 016: Create an approval and park its campaign in one call
+-- Run this in Supabase SQL Editor (Dashboard → SQL Editor → New query)
+--
+-- WebApprovalTool used to insert the approval and then update the campaign
+-- to awaiting_approval as two round-trips. This does both in one
+-- transaction and returns the new approval id.
+
+CREATE OR REPLACE FUNCTION create_approval_and_mark_waiting(
+    p_campaign_id UUID,
+    p_approval_type TEXT,
+    p_payload JSONB,
+    p_subject TEXT,
+    p_reasoning TEXT,
+    p_agent_state TEXT
+)
+RETURNS UUID AS $$
+DECLARE
+    v_id UUID;
+BEGIN
+    INSERT INTO approvals (campaign_id, approval_type, subject, payload, reasoning, status)
+    VALUES (p_campaign_id, p_approval_type, p_subject, p_payload, p_reasoning, 'pending')
+    RETURNING id INTO v_id;
+
+    UPDATE campaigns
+    SET status = 'awaiting_approval',
+        agent_state = COALESCE(p_agent_state, agent_state)
+    WHERE id = p_campaign_id;
+
+    RETURN v_id;
+END;
+$$ LANGUAGE plpgsql;
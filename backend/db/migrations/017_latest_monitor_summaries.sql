@@ -0,0 +1,17 @@
+-- Migration 017: Latest monitor summary per campaign
+-- Run this in Supabase SQL Editor (Dashboard → SQL Editor → New query)
+--
+-- The analytics dashboard only needs each campaign's newest snapshot
+-- summary. DISTINCT ON walks idx_monitor_updates_campaign and returns one
+-- row per campaign instead of shipping every snapshot to the API.
+
+CREATE OR REPLACE FUNCTION latest_monitor_summaries(p_campaign_ids UUID[])
+RETURNS TABLE (
+    campaign_id UUID,
+    summary JSONB
+) AS $$
+    SELECT DISTINCT ON (m.campaign_id) m.campaign_id, m.summary
+    FROM campaign_monitor_updates m
+    WHERE m.campaign_id = ANY(p_campaign_ids)
+    ORDER BY m.campaign_id, m.created_at DESC, m.id;
+$$ LANGUAGE sql STABLE;
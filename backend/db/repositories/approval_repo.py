@@ -1,7 +1,31 @@
 """Approval repository - create, list, decide."""
 
+import logging
+import threading
 from datetime import datetime, timezone
 from backend.db.client import get_supabase
+from backend.db.repositories import campaign_repo
+
+logger = logging.getLogger(__name__)
+
+# The API and the campaign worker run in one process, so a decision made
+# through the API can wake the agent waiting on it instead of leaving it
+# to the next poll. Waiters still poll as a fallback for decisions made
+# elsewhere (another process, direct DB edits).
+_decision_events: dict[str, threading.Event] = {}
+_decision_events_lock = threading.Lock()
+
+
+def decision_event(approval_id: str) -> threading.Event:
+    """Event set when decide_approval() records a decision for this id in-process."""
+    with _decision_events_lock:
+        return _decision_events.setdefault(approval_id, threading.Event())
+
+
+def discard_decision_event(approval_id: str) -> None:
+    """Stop tracking an approval once its waiter is done."""
+    with _decision_events_lock:
+        _decision_events.pop(approval_id, None)
 
 
 def create_approval(
@@ -19,7 +43,7 @@ def create_approval(
     row = {
         "campaign_id": campaign_id,
         "approval_type": approval_type,
-        "subject": subject or f"{approval_type.replace('_', ' ').title()} approval",
+        "subject": subject or _default_subject(approval_type),
         "payload": payload,
         "reasoning": reasoning,
         "status": "pending",
@@ -30,6 +54,63 @@ def create_approval(
     return str(r.data[0]["id"])
 
 
+# PostgREST "function not found" / Postgres undefined_function.
+_MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
+def create_approval_and_mark_waiting(
+    campaign_id: str,
+    approval_type: str,
+    payload: dict,
+    *,
+    subject: str = None,
+    reasoning: str = None,
+    agent_state: str = None,
+):
+    """Insert a pending approval and set the campaign to awaiting_approval.
+
+    One RPC round-trip (migration 016). Returns approval id or None.
+    """
+    sb = get_supabase()
+    if not sb:
+        return None
+    try:
+        r = sb.rpc("create_approval_and_mark_waiting", {
+            "p_campaign_id": campaign_id,
+            "p_approval_type": approval_type,
+            "p_payload": payload,
+            "p_subject": subject or _default_subject(approval_type),
+            "p_reasoning": reasoning,
+            "p_agent_state": agent_state,
+        }).execute()
+    except Exception as e:
+        if getattr(e, "code", None) not in _MISSING_FUNCTION_CODES:
+            # The RPC may have committed before the error reached us (e.g. a
+            # timeout), so a second insert could duplicate the approval.
+            logger.error("create_approval_and_mark_waiting RPC failed for campaign %s: %s", campaign_id, e)
+            return None
+        # Migration 016 not run yet: do the insert and the campaign update separately
+        logger.warning("create_approval_and_mark_waiting RPC missing (%s), using two writes", e)
+        approval_id = create_approval(
+            campaign_id, approval_type, payload, subject=subject, reasoning=reasoning,
+        )
+        if approval_id:
+            updates = {"status": "awaiting_approval"}
+            if agent_state:
+                updates["agent_state"] = agent_state
+            campaign_repo.update_campaign(campaign_id, updates)
+        return approval_id
+    campaign_repo.invalidate(campaign_id)
+    data = r.data
+    if isinstance(data, list):  # scalar results can come back wrapped
+        data = data[0] if data else None
+    return str(data) if data else None
+
+
+def _default_subject(approval_type: str) -> str:
+    return f"{approval_type.replace('_', ' ').title()} approval"
+
+
 def list_approvals(campaign_id: str):
     """List all approvals for a campaign, newest first."""
     sb = get_supabase()
@@ -60,6 +141,29 @@ def list_pending():
     return r.data or []
 
 
+def list_pending_for_brand(brand_id: str):
+    """List pending approvals for a brand's campaigns, newest first.
+
+    Filters through an inner-joined campaigns embed, so ownership is checked
+    in the same query instead of one campaign lookup per approval.
+    """
+    sb = get_supabase()
+    if not sb:
+        return []
+    r = (
+        sb.table("approvals")
+        .select("*, campaigns!inner(brand_id)")
+        .eq("status", "pending")
+        .eq("campaigns.brand_id", brand_id)
+        .order("created_at", desc=True)
+        .execute()
+    )
+    rows = r.data or []
+    for row in rows:
+        row.pop("campaigns", None)  # join only used for the filter
+    return rows
+
+
 def get_approval(approval_id: str):
     """Get a single approval by id."""
     sb = get_supabase()
@@ -83,4 +187,10 @@ def decide_approval(approval_id: str, status: str, feedback: str = None):
         "decided_at": now,
     }
     r = sb.table("approvals").update(updates).eq("id", approval_id).execute()
-    return bool(r.data and len(r.data) > 0)
+    ok = bool(r.data and len(r.data) > 0)
+    if ok:
+        with _decision_events_lock:
+            event = _decision_events.get(approval_id)
+        if event:
+            event.set()
+    return ok
@@ -1,11 +1,70 @@
 """Campaign repository - create, get, update, save result."""
 
+import copy
 import logging
+import threading
+import time
 
+from backend.cache import dashboard_cache
 from backend.db.client import get_supabase
 
 logger = logging.getLogger(__name__)
 
+# Short-lived read cache for get_campaign(). The worker and request handlers
+# re-read the same campaign several times within seconds; every write that
+# goes through this module invalidates the entry, so the TTL only bounds
+# staleness from writers outside it. Process-wide (not thread-local) so an
+# update on one thread is never masked by another thread's cached copy.
+# Rows go in and come out as deep copies: brief/strategy/result_json are
+# nested dicts, and a caller editing one must not change the cached row.
+_CACHE_TTL_SECONDS = 5.0
+_cache: dict[str, tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_get(campaign_id: str):
+    with _cache_lock:
+        entry = _cache.get(campaign_id)
+        if entry is None:
+            return None
+        expires_at, row = entry
+        if time.monotonic() > expires_at:
+            del _cache[campaign_id]
+            return None
+        return copy.deepcopy(row)
+
+
+def _cache_put(row: dict) -> None:
+    expires_at = time.monotonic() + _CACHE_TTL_SECONDS
+    with _cache_lock:
+        for key in (row.get("id"), row.get("short_id")):
+            if key:
+                _cache[str(key)] = (expires_at, row)
+
+
+def invalidate(campaign_id: str = None, brand_id: str = None) -> None:
+    """Drop a campaign (by UUID or short_id) from the read cache, or everything.
+
+    The owning brand's analytics dashboard is dropped too. When the brand
+    isn't passed and the row wasn't cached, every dashboard entry goes.
+    """
+    with _cache_lock:
+        if campaign_id is None:
+            _cache.clear()
+            dashboard_cache.clear()
+            return
+        entry = _cache.pop(campaign_id, None)
+        if entry:
+            row = entry[1]
+            brand_id = brand_id or row.get("brand_id")
+            for key in (row.get("id"), row.get("short_id")):
+                if key:
+                    _cache.pop(str(key), None)
+    if brand_id:
+        dashboard_cache.invalidate(brand_id)
+    else:
+        dashboard_cache.clear()
+
 
 def create_campaign(brief: dict, strategy: dict, *, short_id: str = None, name: str = None, brand_id: str = None, contract_template_id: str = None):
     """Insert campaign; return campaign id (UUID string)."""
@@ -30,15 +89,24 @@ def create_campaign(brief: dict, strategy: dict, *, short_id: str = None, name:
     r = sb.table("campaigns").insert(row).execute()
     if not r.data or len(r.data) == 0:
         return None
+    if brand_id:
+        dashboard_cache.invalidate(brand_id)
     return str(r.data[0]["id"])
 
 
-def list_campaigns(limit: int = 50, brand_id: str = None):
-    """List campaigns for a brand, newest first."""
+def list_campaigns(limit: int = 50, brand_id: str = None, include_brief: bool = False):
+    """List campaigns for a brand, newest first.
+
+    include_brief adds the brief JSON to each row (the analytics dashboard
+    needs budgets; the campaign list page doesn't).
+    """
     sb = get_supabase()
     if not sb:
         return []
-    query = sb.table("campaigns").select("id, short_id, name, status, created_at")
+    columns = "id, short_id, name, status, created_at"
+    if include_brief:
+        columns += ", brief"
+    query = sb.table("campaigns").select(columns)
     if brand_id:
         query = query.eq("brand_id", brand_id)
     r = query.order("created_at", desc=True).limit(limit).execute()
@@ -50,14 +118,17 @@ def get_campaign(campaign_id: str, brand_id: str = None):
     sb = get_supabase()
     if not sb:
         return None
-    # Try UUID first
-    if len(campaign_id) == 36 and campaign_id.count("-") == 4:
-        r = sb.table("campaigns").select("*").eq("id", campaign_id).execute()
-    else:
-        r = sb.table("campaigns").select("*").eq("short_id", campaign_id).execute()
-    if not r.data or len(r.data) == 0:
-        return None
-    row = r.data[0]
+    row = _cache_get(campaign_id)
+    if row is None:
+        # Try UUID first
+        if len(campaign_id) == 36 and campaign_id.count("-") == 4:
+            r = sb.table("campaigns").select("*").eq("id", campaign_id).execute()
+        else:
+            r = sb.table("campaigns").select("*").eq("short_id", campaign_id).execute()
+        if not r.data or len(r.data) == 0:
+            return None
+        row = r.data[0]
+        _cache_put(copy.deepcopy(row))
     # Verify brand ownership
     if brand_id and row.get("brand_id") and row["brand_id"] != brand_id:
         return None
@@ -74,6 +145,7 @@ def update_campaign(campaign_id: str, updates: dict):
         return False
     uuid_id = campaign["id"]
     sb.table("campaigns").update(updates).eq("id", uuid_id).execute()
+    invalidate(uuid_id, brand_id=campaign.get("brand_id"))
     return True
 
 
@@ -87,6 +159,7 @@ def delete_campaign(campaign_id: str, brand_id: str = None):
         return False
     uuid_id = campaign["id"]
     sb.table("campaigns").delete().eq("id", uuid_id).execute()
+    invalidate(uuid_id, brand_id=campaign.get("brand_id"))
     return True
 
 
@@ -104,6 +177,7 @@ def save_campaign_result(campaign_id: str, result: dict):
             "status": "completed",
             "completed_at": now,
         }).eq("id", campaign["id"]).execute()
+        invalidate(campaign["id"], brand_id=campaign.get("brand_id"))
         return True
     # CLI-only run: insert row with short_id and result
     brief = result.get("brief") or {}
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import hashlib
 import logging
+from collections import defaultdict
 from typing import Optional
-from backend.db.client import get_supabase
+from backend.db.client import get_supabase, select_all
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +72,67 @@ def get_delivery_summary(campaign_id: str) -> dict:
             ]
         }
     """
-    events = get_events_by_campaign(campaign_id)
+    return _summarize_events(get_events_by_campaign(campaign_id))
+
+
+def get_delivery_summary_batch(campaign_ids: list[str]) -> dict[str, dict]:
+    """Delivery summaries for several campaigns from one email_events query.
+
+    Returns {campaign_id: summary} with the same shape as get_delivery_summary;
+    campaigns with no events are absent.
+    """
+    sb = get_supabase()
+    if not sb or not campaign_ids:
+        return {}
+    ids = list(campaign_ids)
+    try:
+        rows = select_all(
+            lambda: sb.table("email_events")
+            .select("*")
+            .in_("campaign_id", ids)
+            .order("created_at", desc=True)
+            .order("id")
+        )
+    except Exception as e:
+        logger.warning("Failed to fetch email events batch: %s", e)
+        return {}
+    grouped: dict[str, list[dict]] = defaultdict(list)
+    for ev in rows:
+        grouped[ev.get("campaign_id")].append(ev)
+    return {cid: _summarize_events(events) for cid, events in grouped.items()}
+
+
+def get_delivery_counts_batch(campaign_ids: list[str]) -> dict[str, dict]:
+    """Delivery counts for several campaigns, aggregated in Postgres.
+
+    Same shape as get_delivery_summary_batch but with an empty per_creator
+    list — for callers that only need the totals.
+    """
+    sb = get_supabase()
+    if not sb or not campaign_ids:
+        return {}
+    try:
+        r = sb.rpc("email_delivery_counts", {"p_campaign_ids": list(campaign_ids)}).execute()
+    except Exception as e:
+        # Fallback: if the RPC doesn't exist yet (migration 015 not run),
+        # fold the raw events client-side
+        logger.warning("email_delivery_counts RPC failed (%s), falling back to event scan", e)
+        return get_delivery_summary_batch(campaign_ids)
+    return {
+        row["campaign_id"]: {
+            "total_sent": row.get("total_sent") or 0,
+            "delivered": row.get("delivered") or 0,
+            "opened": row.get("opened") or 0,
+            "clicked": row.get("clicked") or 0,
+            "bounced": row.get("bounced") or 0,
+            "per_creator": [],
+        }
+        for row in r.data or []
+    }
+
+
+def _summarize_events(events: list[dict]) -> dict:
+    """Fold one campaign's email events into a delivery summary."""
     if not events:
         return {"total_sent": 0, "delivered": 0, "opened": 0, "clicked": 0, "bounced": 0, "per_creator": []}
 
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Optional
 
-from backend.db.client import get_supabase
+from backend.db.client import get_supabase, select_all
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,33 @@ def get_engagements(campaign_id: str) -> list[dict]:
         return []
 
 
+def get_engagements_batch(campaign_ids: list[str]) -> dict[str, list[dict]]:
+    """List engagements for several campaigns in one query, newest first.
+
+    Returns {campaign_id: [engagement, ...]}; campaigns with no rows are absent.
+    """
+    sb = get_supabase()
+    if not sb or not campaign_ids:
+        return {}
+    ids = list(campaign_ids)
+    try:
+        # A brand's campaigns together can exceed one response's row cap
+        rows = select_all(
+            lambda: sb.table("creator_engagements")
+            .select("*")
+            .in_("campaign_id", ids)
+            .order("updated_at", desc=True)
+            .order("id")
+        )
+    except Exception as e:
+        logger.warning("Failed to fetch engagements batch: %s", e)
+        return {}
+    grouped: dict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        grouped[row.get("campaign_id")].append(row)
+    return dict(grouped)
+
+
 def get_engagement(campaign_id: str, creator_id: str) -> Optional[dict]:
     """Get a single engagement by campaign + creator."""
     sb = get_supabase()
@@ -12,6 +12,7 @@ import socket
 from datetime import datetime, timezone
 
 from backend.db.client import get_supabase
+from backend.db.repositories import campaign_repo
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +52,32 @@ def enqueue(campaign_id: str) -> str | None:
     return None
 
 
+def enqueue_batch(campaign_ids: list[str]) -> dict[str, str]:
+    """Queue several campaigns with one upsert. Returns {campaign_id: job_id}."""
+    sb = get_supabase()
+    if not sb or not campaign_ids:
+        return {}
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {
+            "campaign_id": cid,
+            "status": "queued",
+            "locked_by": None,
+            "locked_at": None,
+            "attempts": 0,
+            "last_error": None,
+            "updated_at": now,
+        }
+        for cid in dict.fromkeys(campaign_ids)
+    ]
+    try:
+        r = sb.table("campaign_jobs").upsert(rows, on_conflict="campaign_id").execute()
+        return {row["campaign_id"]: str(row["id"]) for row in r.data or []}
+    except Exception as e:
+        logger.warning("Failed to enqueue %d campaign jobs: %s", len(rows), e)
+    return {}
+
+
 def claim_next() -> dict | None:
     """Claim the oldest queued job. Returns the job row or None.
 
@@ -193,6 +220,7 @@ def recover_stale_jobs() -> int:
                 sb.table("campaigns").update(
                     {"status": "running", "agent_state": "brief_received"}
                 ).eq("id", job["campaign_id"]).execute()
+                campaign_repo.invalidate(job["campaign_id"])
 
             count += 1
             logger.info(
@@ -9,10 +9,13 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from backend.db.client import get_supabase
+from backend.db.client import get_supabase, select_all
 
 logger = logging.getLogger(__name__)
 
+# PostgREST "function not found" / Postgres undefined_function.
+_MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
 
 def save_monitor_snapshot(
     campaign_id: str,
@@ -69,6 +72,50 @@ def get_monitor_summary(campaign_id: str) -> dict:
     return snapshot.get("summary") or {}
 
 
+def get_monitor_summary_batch(campaign_ids: list[str]) -> dict[str, dict]:
+    """Latest snapshot summary for several campaigns in one query.
+
+    Returns {campaign_id: summary}; campaigns with no snapshot are absent.
+    """
+    sb = get_supabase()
+    if not sb or not campaign_ids:
+        return {}
+    ids = list(campaign_ids)
+    try:
+        r = sb.rpc("latest_monitor_summaries", {"p_campaign_ids": ids}).execute()
+    except Exception as e:
+        if getattr(e, "code", None) not in _MISSING_FUNCTION_CODES:
+            logger.warning("Failed to get monitor summaries batch: %s", e)
+            return {}
+        # Migration 017 not run yet: scan the snapshots client-side
+        logger.warning("latest_monitor_summaries RPC missing (%s), falling back to snapshot scan", e)
+        return _scan_monitor_summaries(sb, ids)
+    return {str(row["campaign_id"]): row.get("summary") or {} for row in r.data or []}
+
+
+def _scan_monitor_summaries(sb, ids: list[str]) -> dict[str, dict]:
+    """Newest summary per campaign by paging through every snapshot."""
+    try:
+        # Every snapshot of every campaign matches, so page past the row cap
+        rows = select_all(
+            lambda: sb.table("campaign_monitor_updates")
+            .select("id, campaign_id, summary, created_at")
+            .in_("campaign_id", ids)
+            .order("created_at", desc=True)
+            .order("id")
+        )
+    except Exception as e:
+        logger.warning("Failed to get monitor summaries batch: %s", e)
+        return {}
+    summaries: dict[str, dict] = {}
+    for row in rows:
+        # Rows are newest first — keep the first one seen per campaign
+        cid = row.get("campaign_id")
+        if cid not in summaries:
+            summaries[cid] = row.get("summary") or {}
+    return summaries
+
+
 def get_monitor_updates(campaign_id: str) -> list:
     """Get the full updates from the latest monitor snapshot.
 
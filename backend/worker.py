@@ -11,6 +11,7 @@ campaign which were lost on server restart.
 from __future__ import annotations
 
 import logging
+import random
 import threading
 import time
 
@@ -21,6 +22,17 @@ logger = logging.getLogger(__name__)
 _worker_thread: threading.Thread | None = None
 _stop_event = threading.Event()
 
+# Backoff after unexpected loop errors: 1s → 2s → 4s … capped at 60s, reset
+# on the next successful claim_next() call.
+_BACKOFF_BASE_S = 1.0
+_BACKOFF_CAP_S = 60.0
+
+# Consecutive agent_state write failures per campaign. Once a campaign hits
+# the limit, _on_step stops writing for the rest of the run — the completion
+# write at the end records the final state anyway.
+_on_step_failures: dict[str, int] = {}
+_ON_STEP_MAX_FAILURES = 3
+
 
 def _execute_campaign(campaign_id: str) -> None:
     """Run a single campaign (same logic as the old _run() inline function)."""
@@ -42,7 +54,7 @@ def _execute_campaign(campaign_id: str) -> None:
     from tools.approval import WebApprovalTool
     from models.actions import AgentActionType
 
-    brief = CampaignBrief(**brief_data)
+    brief = CampaignBrief.model_validate(brief_data)
     agent = HudeyAgent(no_send=False)
 
     # Swap approval tool for web version
@@ -52,26 +64,47 @@ def _execute_campaign(campaign_id: str) -> None:
     agent.tool_map[AgentActionType.REQUEST_TERMS_APPROVAL] = web_approval
 
     def _on_step(ctx):
+        # The completion write below sets agent_state="completed" together
+        # with status/result_json — don't spend a separate PATCH on it here.
+        if ctx.is_complete:
+            return
+        failures = _on_step_failures.get(campaign_id, 0)
+        if failures >= _ON_STEP_MAX_FAILURES:
+            return
         try:
             db_update(campaign_id, {"agent_state": ctx.state.value})
         except Exception as e:
+            # A progress write must never abort the run; the failure counter
+            # below is what stops us hammering a broken connection.
+            failures += 1
+            _on_step_failures[campaign_id] = failures
             logger.warning(
-                "Campaign %s: on_step DB update failed (state=%s): %s — retrying with fresh client",
-                campaign_id, ctx.state.value, e,
+                "Campaign %s: on_step DB update failed (state=%s, %d/%d): %s",
+                campaign_id, ctx.state.value, failures, _ON_STEP_MAX_FAILURES, e,
             )
-            try:
-                from backend.db.client import reset_supabase
-                reset_supabase()
-                db_update(campaign_id, {"agent_state": ctx.state.value})
-            except Exception as retry_err:
-                # Non-fatal for step tracking, but capture so we see it.
+            # Next attempt gets a fresh connection
+            from backend.db.client import reset_supabase
+            reset_supabase()
+            if failures >= _ON_STEP_MAX_FAILURES:
                 logger.error(
-                    "Campaign %s: on_step retry also failed (state=%s): %s",
-                    campaign_id, ctx.state.value, retry_err,
+                    "Campaign %s: suspending on_step updates for this run", campaign_id,
                 )
-                sentry_sdk.capture_exception(retry_err)
+                sentry_sdk.capture_exception(e)
+            return
+        if failures:
+            _on_step_failures[campaign_id] = failures - 1
 
-    context = agent.execute_campaign(brief, approve_all=False, on_step=_on_step)
+    try:
+        context = agent.execute_campaign(brief, approve_all=False, on_step=_on_step)
+    finally:
+        _on_step_failures.pop(campaign_id, None)
+
+    if not context.is_complete:
+        # The loop only stops short when an approval timed out. That's a
+        # final outcome, not a retryable error, so the job completes and the
+        # campaign leaves awaiting_approval as failed.
+        _mark_approval_timed_out(campaign_id, get_campaign, db_update)
+        return
 
     # Build monitor summary from context (non-fatal — report still saved if this fails)
     monitor_summary = {}
@@ -145,6 +178,29 @@ def _execute_campaign(campaign_id: str) -> None:
         sentry_sdk.capture_exception(e)
 
 
+def _mark_approval_timed_out(campaign_id: str, get_campaign, db_update) -> None:
+    db_update(campaign_id, {"status": "failed", "agent_state": "approval_timed_out"})
+    logger.info("Campaign %s stopped: approval timed out", campaign_id)
+
+    try:
+        from backend.db.repositories.notification_repo import maybe_create_notification
+        cmp = get_campaign(campaign_id)
+        if cmp and cmp.get("brand_id"):
+            campaign_name = cmp.get("name", "Campaign")
+            short_id = cmp.get("short_id") or campaign_id
+            maybe_create_notification(
+                brand_id=cmp["brand_id"],
+                notification_type="campaign_completion",
+                title=f"{campaign_name} stopped",
+                body="No approval decision was made in time. Start the campaign again to continue.",
+                campaign_id=campaign_id,
+                link=f"/campaigns/{short_id}",
+            )
+    except Exception as e:
+        logger.warning("Campaign %s: timeout notification failed: %s", campaign_id, e)
+        sentry_sdk.capture_exception(e)
+
+
 def _worker_loop() -> None:
     """Main worker loop — poll for jobs, execute them."""
     from backend.db.repositories import job_repo
@@ -159,9 +215,11 @@ def _worker_loop() -> None:
     except Exception as e:
         logger.warning("Failed to recover stale jobs on startup: %s", e)
 
+    backoff_s = _BACKOFF_BASE_S
     while not _stop_event.is_set():
         try:
             job = job_repo.claim_next()
+            backoff_s = _BACKOFF_BASE_S
             if not job:
                 # No work — sleep and poll again
                 _stop_event.wait(5)
@@ -228,8 +286,10 @@ def _worker_loop() -> None:
 
         except Exception as e:
             sentry_sdk.capture_exception(e)
-            logger.exception("Worker loop error: %s", e)
-            _stop_event.wait(10)  # Back off on unexpected errors
+            delay = backoff_s + random.uniform(0, backoff_s * 0.2)
+            logger.exception("Worker loop error (backing off %.1fs): %s", delay, e)
+            _stop_event.wait(delay)
+            backoff_s = min(backoff_s * 2, _BACKOFF_CAP_S)
 
 
 def start_worker() -> None:
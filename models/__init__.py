@@ -1,3 +1,12 @@
+"""Campaign domain models.
+
+Trusted outputs: a ``ToolResult.output`` carrying ``"_trusted": True`` promises
+that every nested model dict (strategy, creators, engagements) came from
+``model_dump()`` of an already-validated model in this process.
+``CampaignContext.update`` rebuilds those with ``model_construct`` and skips
+validation. Never set the flag on data from the LLM, webhooks or external APIs.
+"""
+
 from models.actions import AgentAction, AgentActionType, ToolResult
 from models.brief import CampaignBrief, CreatorCriteria
 from models.campaign import CampaignStrategy, Creator, CreatorEngagement, EngagementStatus
@@ -1,10 +1,11 @@
 """Campaign context and state machine."""
 
-import uuid
+import os
+from collections import deque
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
 from models.brief import CampaignBrief, CreatorCriteria
 
@@ -31,10 +32,34 @@ class CampaignState(str, Enum):
     COMPLETED = "completed"
 
 
+# Approval transitions: source state -> next state on approve / reject.
+_ADVANCE: dict[CampaignState, CampaignState] = {
+    CampaignState.AWAITING_BRIEF_APPROVAL: CampaignState.CREATOR_DISCOVERY,
+    CampaignState.AWAITING_CREATOR_APPROVAL: CampaignState.OUTREACH_DRAFT,
+    CampaignState.AWAITING_OUTREACH_APPROVAL: CampaignState.OUTREACH_IN_PROG,
+    CampaignState.AWAITING_TERMS_APPROVAL: CampaignState.PAYMENT_PENDING,
+}
+_REVERT: dict[CampaignState, CampaignState] = {
+    CampaignState.AWAITING_BRIEF_APPROVAL: CampaignState.STRATEGY_DRAFT,
+    CampaignState.AWAITING_CREATOR_APPROVAL: CampaignState.CREATOR_DISCOVERY,
+    CampaignState.AWAITING_OUTREACH_APPROVAL: CampaignState.OUTREACH_DRAFT,
+    CampaignState.AWAITING_TERMS_APPROVAL: CampaignState.NEGOTIATION,
+}
+
+
+# Debug trail only — keep the most recent entries instead of growing forever.
+_HISTORY_MAXLEN = 100
+
+
+def _short_id() -> str:
+    """8 hex chars (32 random bits) — same shape as the old ``uuid4()[:8]``."""
+    return os.urandom(4).hex()
+
+
 class CampaignContext(BaseModel):
     """Holds campaign state and data through the workflow."""
 
-    campaign_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    campaign_id: str = Field(default_factory=_short_id)
     brief: Optional[CampaignBrief] = None
     strategy: Optional[CampaignStrategy] = None
     creators: list[Creator] = Field(default_factory=list)
@@ -58,10 +83,21 @@ class CampaignContext(BaseModel):
     report: Optional[dict[str, Any]] = None
     state: CampaignState = Field(default=CampaignState.BRIEF_RECEIVED)
     approval_queue: list[dict[str, Any]] = Field(default_factory=list)
-    history: list[dict[str, Any]] = Field(default_factory=list)
+    history: deque[dict[str, Any]] = Field(
+        default_factory=lambda: deque(maxlen=_HISTORY_MAXLEN),
+    )
 
     model_config = {"arbitrary_types_allowed": True}
 
+    @field_validator("history", mode="after")
+    @classmethod
+    def _cap_history(cls, v: deque) -> deque:
+        return v if v.maxlen == _HISTORY_MAXLEN else deque(v, maxlen=_HISTORY_MAXLEN)
+
+    @field_serializer("history")
+    def _dump_history(self, v: deque) -> list[dict[str, Any]]:
+        return list(v)
+
     @property
     def is_complete(self) -> bool:
         """True when campaign has reached COMPLETED state."""
@@ -81,95 +117,143 @@ class CampaignContext(BaseModel):
             return
 
         output = result.output or {}
+        matched = _HANDLERS.keys() & output.keys()
+        if matched:
+            # Several discriminating keys can co-occur (e.g. "outreach_sent" +
+            # "state"); the earliest entry in _HANDLERS wins.
+            key = matched.pop() if len(matched) == 1 else min(matched, key=_HANDLER_RANK.__getitem__)
+            _HANDLERS[key](self, output)
 
-        if "strategy" in output:
-            from models.campaign import CampaignStrategy
-
-            s = output["strategy"]
-            self.strategy = CampaignStrategy(**s) if isinstance(s, dict) else s
-            self.state = CampaignState.STRATEGY_DRAFT
-        elif "creators" in output:
-            self.creators = [
-                Creator(**c) if isinstance(c, dict) else c
-                for c in output["creators"]
-            ]
-            if "creator_criteria" in output:
-                from models.brief import CreatorCriteria
-
-                cr = output["creator_criteria"]
-                self.creator_criteria = (
-                    CreatorCriteria(**cr) if isinstance(cr, dict) else cr
-                )
-            self.state = CampaignState.CREATOR_DISCOVERY
-        elif "outreach_drafts" in output:
-            self.outreach_drafts = output["outreach_drafts"]
-            self.state = CampaignState.OUTREACH_DRAFT
-        elif "outreach_sent" in output:
-            self.outreach_sent = output["outreach_sent"]
-            if output.get("state"):
-                self.state = CampaignState(output["state"])
-            else:
-                self.state = CampaignState.OUTREACH_IN_PROG
-        elif "engagements" in output:
-            raw = output["engagements"]
-            self.engagements = {
-                k: CreatorEngagement(**v) if isinstance(v, dict) else v
-                for k, v in raw.items()
-            }
-            if output.get("state"):
-                self.state = CampaignState(output["state"])
-            else:
-                self.state = CampaignState.NEGOTIATION
-        elif "counter_offer" in output:
-            self.pending_counter_offer = output["counter_offer"]
-            self.pending_creator_id = output.get("creator_id")
-            self.state = CampaignState.AWAITING_TERMS_APPROVAL
-        elif "payment_instructions" in output:
-            if output.get("state"):
-                self.state = CampaignState(output["state"])
-            else:
-                self.state = CampaignState.CAMPAIGN_ACTIVE
-        elif "monitor_updates" in output:
-            self.monitor_updates = output["monitor_updates"]
-            if "monitor_summary" in output:
-                self.monitor_summary = output["monitor_summary"]
-            if output.get("state"):
-                self.state = CampaignState(output["state"])
-            else:
-                self.state = CampaignState.CAMPAIGN_ACTIVE
-        elif "report" in output:
-            self.report = output["report"]
-            self.state = CampaignState.COMPLETED
-        elif "approval_granted" in output:
-            if output.get("approval_granted"):
-                self._advance_after_approval()
-            else:
-                self._handle_rejection(output.get("feedback", ""))
-        elif "state" in output:
-            self.state = CampaignState(output["state"])
-        elif "complete" in output and output["complete"]:
-            self.state = CampaignState.COMPLETED
-
-        self.history.append({"state": self.state, "output_keys": list(output.keys())})
+        self.history.append({"state": self.state, "output_keys": tuple(output)})
 
     def _advance_after_approval(self) -> None:
         """Move to next state after human approval."""
-        transitions = {
-            CampaignState.AWAITING_BRIEF_APPROVAL: CampaignState.CREATOR_DISCOVERY,
-            CampaignState.AWAITING_CREATOR_APPROVAL: CampaignState.OUTREACH_DRAFT,
-            CampaignState.AWAITING_OUTREACH_APPROVAL: CampaignState.OUTREACH_IN_PROG,
-            CampaignState.AWAITING_TERMS_APPROVAL: CampaignState.PAYMENT_PENDING,
-        }
-        self.state = transitions.get(self.state, self.state)
+        self.state = _ADVANCE.get(self.state, self.state)
 
     def _handle_rejection(self, feedback: str) -> None:
         """Handle approval rejection - revert to previous editable state."""
-        revert = {
-            CampaignState.AWAITING_BRIEF_APPROVAL: CampaignState.STRATEGY_DRAFT,
-            CampaignState.AWAITING_CREATOR_APPROVAL: CampaignState.CREATOR_DISCOVERY,
-            CampaignState.AWAITING_OUTREACH_APPROVAL: CampaignState.OUTREACH_DRAFT,
-            CampaignState.AWAITING_TERMS_APPROVAL: CampaignState.NEGOTIATION,
-        }
-        self.state = revert.get(self.state, self.state)
+        self.state = _REVERT.get(self.state, self.state)
         if feedback:
             self.history.append({"rejection_feedback": feedback})
+
+
+# ── update() handlers ─────────────────────────────────────────────
+# Outputs flagged ``_trusted`` were produced by ``model_dump()`` inside this
+# process, so rebuilding the models can skip validation.
+
+
+def _is_trusted(output: dict[str, Any]) -> bool:
+    return output.get("_trusted") is True
+
+
+def _h_strategy(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    s = output["strategy"]
+    if isinstance(s, dict):
+        s = CampaignStrategy.model_construct(**s) if _is_trusted(output) else CampaignStrategy(**s)
+    ctx.strategy = s
+    ctx.state = CampaignState.STRATEGY_DRAFT
+
+
+def _h_creators(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    make_creator = Creator.model_construct if _is_trusted(output) else Creator
+    ctx.creators = [
+        make_creator(**c) if isinstance(c, dict) else c
+        for c in output["creators"]
+    ]
+    if "creator_criteria" in output:
+        cr = output["creator_criteria"]
+        ctx.creator_criteria = CreatorCriteria(**cr) if isinstance(cr, dict) else cr
+    ctx.state = CampaignState.CREATOR_DISCOVERY
+
+
+def _h_outreach_drafts(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.outreach_drafts = output["outreach_drafts"]
+    ctx.state = CampaignState.OUTREACH_DRAFT
+
+
+def _h_outreach_sent(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.outreach_sent = output["outreach_sent"]
+    if output.get("state"):
+        ctx.state = CampaignState(output["state"])
+    else:
+        ctx.state = CampaignState.OUTREACH_IN_PROG
+
+
+def _h_engagements(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    if _is_trusted(output):
+        ctx.engagements = {
+            k: CreatorEngagement.model_construct(**v) if isinstance(v, dict) else v
+            for k, v in output["engagements"].items()
+        }
+    else:
+        ctx.engagements = {
+            k: CreatorEngagement.model_validate(v) if isinstance(v, dict) else v
+            for k, v in output["engagements"].items()
+        }
+    if output.get("state"):
+        ctx.state = CampaignState(output["state"])
+    else:
+        ctx.state = CampaignState.NEGOTIATION
+
+
+def _h_counter_offer(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.pending_counter_offer = output["counter_offer"]
+    ctx.pending_creator_id = output.get("creator_id")
+    ctx.state = CampaignState.AWAITING_TERMS_APPROVAL
+
+
+def _h_payment_instructions(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    if output.get("state"):
+        ctx.state = CampaignState(output["state"])
+    else:
+        ctx.state = CampaignState.CAMPAIGN_ACTIVE
+
+
+def _h_monitor_updates(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.monitor_updates = output["monitor_updates"]
+    if "monitor_summary" in output:
+        ctx.monitor_summary = output["monitor_summary"]
+    if output.get("state"):
+        ctx.state = CampaignState(output["state"])
+    else:
+        ctx.state = CampaignState.CAMPAIGN_ACTIVE
+
+
+def _h_report(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.report = output["report"]
+    ctx.state = CampaignState.COMPLETED
+
+
+def _h_approval_granted(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    if output.get("approval_granted"):
+        ctx._advance_after_approval()
+    else:
+        ctx._handle_rejection(output.get("feedback", ""))
+
+
+def _h_state(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    ctx.state = CampaignState(output["state"])
+
+
+def _h_complete(ctx: CampaignContext, output: dict[str, Any]) -> None:
+    if output["complete"]:
+        ctx.state = CampaignState.COMPLETED
+
+
+# Ordered by precedence: when an output carries several keys, the first
+# matching entry handles it.
+_HANDLERS: dict[str, Callable[[CampaignContext, dict[str, Any]], None]] = {
+    "strategy": _h_strategy,
+    "creators": _h_creators,
+    "outreach_drafts": _h_outreach_drafts,
+    "outreach_sent": _h_outreach_sent,
+    "engagements": _h_engagements,
+    "counter_offer": _h_counter_offer,
+    "payment_instructions": _h_payment_instructions,
+    "monitor_updates": _h_monitor_updates,
+    "report": _h_report,
+    "approval_granted": _h_approval_granted,
+    "state": _h_state,
+    "complete": _h_complete,
+}
+_HANDLER_RANK = {key: i for i, key in enumerate(_HANDLERS)}
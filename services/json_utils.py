@@ -0,0 +1,28 @@
+"""JSON encoding shared by the .tmp stores and report writers."""
+
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+def _default(obj: Any) -> str:
+    # Datetimes as ISO 8601; anything else json can't encode as its str().
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Serialise to JSON; compact unless an indent is given."""
+    if indent is None:
+        return json.dumps(obj, default=_default, separators=(",", ":"))
+    return json.dumps(obj, default=_default, indent=indent)
+
+
+def write_json_atomic(path: Path, obj: Any, indent: Optional[int] = None) -> None:
+    """Write JSON via a temp file and rename, so readers never see a partial file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(dumps(obj, indent))
+    os.replace(tmp_path, path)
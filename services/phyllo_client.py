@@ -2,17 +2,48 @@
 
 import logging
 import os
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from typing import Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+from services.json_utils import dumps
+
+try:
+    from backend.cache import cache_key, insightiq_get_cache, insightiq_job_cache
+except ImportError:  # CLI/tool use without the backend package — no response caching
+    cache_key = insightiq_get_cache = insightiq_job_cache = None
 
 logger = logging.getLogger(__name__)
 
 # InsightIQ (formerly Phyllo) API - https://docs.insightiq.ai
 DEFAULT_BASE_URL = "https://api.insightiq.ai/v1"
 
+# (connect, read) seconds
+_TIMEOUT = (5, 30)
+
+_JOB_DONE = ("COMPLETED", "SUCCESS", "DONE")
+_JOB_FAILED = ("FAILED", "ERROR")
+
+# _poll_job full-jitter backoff: sleep uniform(0, min(cap, base * 2**attempt))
+_POLL_BASE_S = 0.5
+_POLL_CAP_S = 10.0
+
+# ETags kept per client for conditional job polls. Poll loops drop theirs
+# when they end; the cap covers one-off uncached GETs on a long-lived client.
+_ETAG_MAX_ENTRIES = 256
+
+
+def _job_done(resp: Optional[dict]) -> bool:
+    return bool(resp) and str(resp.get("status", "")).upper() in _JOB_DONE
+
 
 class PhylloClient:
     """Client for Phyllo Creator Search and Public Content APIs."""
@@ -34,6 +65,42 @@ class PhylloClient:
         # Stashed on every failed request so callers (and the /search endpoint)
         # can surface a useful error instead of a silent empty list.
         self.last_error: Optional[dict] = None
+        # path -> (ETag, body) from the last uncached GET, for conditional polls
+        self._etags: dict[str, tuple[str, dict]] = {}
+
+        # Credentials don't change at runtime — build auth/headers once.
+        self._auth_obj: Optional[HTTPBasicAuth] = (
+            HTTPBasicAuth(self.client_id, self.client_secret)
+            if self.client_id and self.client_secret
+            else None
+        )
+        self._static_headers: dict[str, str] = {"Content-Type": "application/json"}
+        if self.api_key and not self._auth_obj:
+            self._static_headers["Authorization"] = f"Bearer {self.api_key}"
+
+        # One pooled session per client so repeat calls reuse the TLS connection.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ))
+        self._session.auth = self._auth_obj
+        self._session.headers.update(self._static_headers)
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "PhylloClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     @property
     def is_configured(self) -> bool:
@@ -44,15 +111,10 @@ class PhylloClient:
         )
 
     def _auth(self) -> Optional[HTTPBasicAuth]:
-        if self.client_id and self.client_secret:
-            return HTTPBasicAuth(self.client_id, self.client_secret)
-        return None
+        return self._auth_obj
 
     def _headers(self) -> dict[str, str]:
-        h = {"Content-Type": "application/json"}
-        if self.api_key and not self._auth():
-            h["Authorization"] = f"Bearer {self.api_key}"
-        return h
+        return dict(self._static_headers)
 
     def _capture_error(self, method: str, path: str, exc: Exception) -> None:
         """Stash the last error so callers can surface it (instead of silent empty)."""
@@ -70,19 +132,43 @@ class PhylloClient:
                 pass
         self.last_error = info
 
-    def _get(self, path: str, params: Optional[dict] = None) -> Optional[dict]:
+    def _get(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        no_cache: bool = False,
+    ) -> Optional[dict]:
+        """GET with a short-lived shared cache; ``no_cache`` forces a fetch."""
         if not self.is_configured:
             return None
+        key = None
+        if not no_cache and insightiq_get_cache is not None:
+            key = cache_key(self.base_url, path, params or {})
+            cached = insightiq_get_cache.get(key)
+            if cached is not None:
+                return cached
+        # Uncached fetches (job polls) revalidate with the last ETag so an
+        # unchanged "pending" payload comes back as a bodiless 304.
+        prev = self._etags.get(path) if no_cache and params is None else None
         try:
-            r = requests.get(
+            r = self._session.get(
                 f"{self.base_url}{path}",
-                auth=self._auth(),
-                headers=self._headers(),
                 params=params,
-                timeout=30,
+                headers={"If-None-Match": prev[0]} if prev else None,
+                timeout=_TIMEOUT,
             )
+            if r.status_code == 304 and prev:
+                return prev[1]
             r.raise_for_status()
-            return r.json()
+            data = r.json()
+            if key is not None:
+                insightiq_get_cache.set(key, data)
+            elif no_cache and params is None and r.headers.get("ETag"):
+                if path not in self._etags and len(self._etags) >= _ETAG_MAX_ENTRIES:
+                    # Oldest first (insertion order)
+                    self._etags.pop(next(iter(self._etags), None), None)
+                self._etags[path] = (r.headers["ETag"], data)
+            return data
         except requests.RequestException as e:
             logger.warning("InsightIQ GET %s failed: %s", path, e)
             self._capture_error("GET", path, e)
@@ -95,12 +181,12 @@ class PhylloClient:
         if not self.is_configured:
             return None
         try:
-            r = requests.post(
+            # Content-Type is already on the session, so a pre-encoded body
+            # can go straight through ``data=``.
+            r = self._session.post(
                 f"{self.base_url}{path}",
-                auth=self._auth(),
-                headers=self._headers(),
-                json=body,
-                timeout=30,
+                data=dumps(body),
+                timeout=_TIMEOUT,
             )
             r.raise_for_status()
             return r.json()
@@ -114,7 +200,7 @@ class PhylloClient:
             self._capture_error("POST", path, e)
             return None
 
-    # InsightIQ work_platform_id mapping
+    # InsightIQ work_platform_id mapping (keys are lowercase, trimmed)
     PLATFORM_IDS: dict[str, str] = {
         "instagram": "9bb8913b-ddd9-430b-a66a-d74d846e6c66",
         "tiktok": "de55aeec-0dc8-4119-bf90-16b3d1f0c987",
@@ -144,20 +230,22 @@ class PhylloClient:
         if not self.is_configured:
             return []
 
-        # Resolve platform names to InsightIQ work_platform_ids
-        resolved = [
-            self.PLATFORM_IDS.get(p.lower().strip())
-            for p in (platforms or ["instagram"])
-        ]
+        # Resolve platform names to InsightIQ work_platform_ids. dict.fromkeys
+        # drops repeats ("x" and "twitter" share an id) so each platform is
+        # searched once, in request order.
+        lookup = self.PLATFORM_IDS
+        resolved = dict.fromkeys(
+            lookup.get(p.strip().lower()) for p in (platforms or ("instagram",))
+        )
+        resolved.pop(None, None)
         # Default to Instagram if no valid platform found
-        platform_ids = [pid for pid in resolved if pid]
+        platform_ids = list(resolved)
         if not platform_ids:
             platform_ids = [self.PLATFORM_IDS["instagram"]]
 
-        all_results: list[dict[str, Any]] = []
         per_platform_limit = max(limit // len(platform_ids), 5)
 
-        for platform_id in platform_ids:
+        def _search_platform(platform_id: str) -> list[dict[str, Any]]:
             body: dict[str, Any] = {
                 "work_platform_id": platform_id,
                 "sort_by": {"field": "FOLLOWER_COUNT", "order": "DESCENDING"},
@@ -173,8 +261,18 @@ class PhylloClient:
             if resp:
                 data = resp.get("data", resp) if isinstance(resp, dict) else resp
                 if isinstance(data, list):
-                    all_results.extend(data)
+                    return data
+            return []
 
+        # One POST per platform — fan out so wall time is ~1 RTT, not N.
+        # pool.map keeps results in platform order.
+        if len(platform_ids) == 1:
+            pages = [_search_platform(platform_ids[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(platform_ids)) as pool:
+                pages = list(pool.map(_search_platform, platform_ids))
+
+        all_results: list[dict[str, Any]] = [c for page in pages for c in page]
         return all_results[:limit]
 
     def get_creator_content(
@@ -210,28 +308,91 @@ class PhylloClient:
 
     # ── Async job helpers ───────────────────────────────────────
 
+    def _get_job(self, path_prefix: str, job_id: str) -> Optional[dict]:
+        """Fetch an analysis job; finished results are served from cache."""
+        jk = None
+        if insightiq_job_cache is not None:
+            jk = cache_key(self.base_url, path_prefix, job_id)
+            cached = insightiq_job_cache.get(jk)
+            if cached is not None:
+                return cached
+        path = f"{path_prefix}/{job_id}"
+        resp = self._get(path, no_cache=True)
+        if _job_done(resp):
+            if jk is not None:
+                insightiq_job_cache.set(jk, resp)
+            self._etags.pop(path, None)
+        return resp
+
+    # In-flight polls shared across all clients: (base_url, path_prefix, job_id) -> Future
+    _inflight: dict[tuple[str, str, str], Future] = {}
+    _inflight_lock = threading.Lock()
+
     def _poll_job(self, job_id: str, path_prefix: str, max_wait: int = 60) -> Optional[dict]:
         """Poll an async InsightIQ job until complete or timeout.
 
         InsightIQ analysis endpoints (brand fit, purchase intent, comments relevance)
         are async: POST creates a job, GET retrieves results when ready.
+        Concurrent callers for the same job share a single polling loop.
         """
+        key = (self.base_url, path_prefix, job_id)
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            try:
+                return fut.result(timeout=max_wait)
+            except FutureTimeout:
+                logger.warning("InsightIQ job %s timed out after %ds", job_id, max_wait)
+                return None
+
+        try:
+            result = self._poll_job_loop(job_id, path_prefix, max_wait)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            # Done, failed or timed out, nothing revalidates this job again
+            self._etags.pop(f"{path_prefix}/{job_id}", None)
+
+    def _wait_created(self, resp: Optional[dict], path_prefix: str, max_wait: float) -> Optional[dict]:
+        """Finish a create_* response: return it if done/synchronous, else poll its job."""
+        if not resp:
+            return None
+        job_id = resp.get("id") or resp.get("analysis_id") or resp.get("request_id")
+        if not job_id or _job_done(resp):
+            return resp
+        return self._poll_job(job_id, path_prefix, max_wait)
+
+    def _poll_job_loop(self, job_id: str, path_prefix: str, max_wait: int) -> Optional[dict]:
         deadline = time.monotonic() + max_wait
-        interval = 2
+        attempt = 0
         while time.monotonic() < deadline:
-            resp = self._get(f"{path_prefix}/{job_id}")
+            resp = self._get_job(path_prefix, job_id)
             if resp:
                 status = resp.get("status", "").upper()
-                if status in ("COMPLETED", "SUCCESS", "DONE"):
+                if status in _JOB_DONE:
                     return resp
-                if status in ("FAILED", "ERROR"):
+                if status in _JOB_FAILED:
                     logger.warning("InsightIQ job %s failed: %s", job_id, resp)
                     return None
             remaining = deadline - time.monotonic()
             if remaining <= 0:
                 break
-            time.sleep(min(interval, remaining))
-            interval = min(interval * 1.5, 8)  # Back off, capped at 8s
+            # Full jitter: fast jobs get picked up early, and concurrent
+            # pollers don't fall into lockstep against the API.
+            delay = random.uniform(0, min(_POLL_CAP_S, _POLL_BASE_S * (2 ** attempt)))
+            time.sleep(min(delay, remaining))
+            attempt += 1
         logger.warning("InsightIQ job %s timed out after %ds", job_id, max_wait)
         return None
 
@@ -274,7 +435,7 @@ class PhylloClient:
         """
         if not self.is_configured:
             return None
-        return self._get(f"/social/creators/brand-fit/{analysis_id}")
+        return self._get_job("/social/creators/brand-fit", analysis_id)
 
     def analyze_brand_fit(
         self,
@@ -295,6 +456,8 @@ class PhylloClient:
         if not job_id:
             # Response might be synchronous
             return resp
+        if _job_done(resp):
+            return resp
         return self._poll_job(job_id, "/social/creators/brand-fit", max_wait)
 
     # ── Purchase Intent Analysis ────────────────────────────────
@@ -333,7 +496,7 @@ class PhylloClient:
         """
         if not self.is_configured:
             return None
-        return self._get(f"/social/creators/comments/purchase-intent/{analysis_id}")
+        return self._get_job("/social/creators/comments/purchase-intent", analysis_id)
 
     def analyze_purchase_intent(
         self,
@@ -344,12 +507,11 @@ class PhylloClient:
     ) -> Optional[dict]:
         """Create and poll purchase intent analysis (convenience method)."""
         resp = self.create_purchase_intent(content_id, product_name, product_description)
-        if not resp:
-            return None
-        job_id = resp.get("id") or resp.get("analysis_id") or resp.get("request_id")
-        if not job_id:
-            return resp
-        return self._poll_job(job_id, "/social/creators/comments/purchase-intent", max_wait)
+        return self.wait_purchase_intent(resp, max_wait)
+
+    def wait_purchase_intent(self, created: Optional[dict], max_wait: float = 60) -> Optional[dict]:
+        """Poll a job returned by create_purchase_intent() until it completes."""
+        return self._wait_created(created, "/social/creators/comments/purchase-intent", max_wait)
 
     # ── Comments Relevance Analysis ─────────────────────────────
 
@@ -387,7 +549,7 @@ class PhylloClient:
         """
         if not self.is_configured:
             return None
-        return self._get(f"/social/creators/comments/relevance/{analysis_id}")
+        return self._get_job("/social/creators/comments/relevance", analysis_id)
 
     def analyze_comments_relevance(
         self,
@@ -398,9 +560,8 @@ class PhylloClient:
     ) -> Optional[dict]:
         """Create and poll comments relevance analysis (convenience method)."""
         resp = self.create_comments_relevance(content_id, product_name, product_description)
-        if not resp:
-            return None
-        job_id = resp.get("id") or resp.get("analysis_id") or resp.get("request_id")
-        if not job_id:
-            return resp
-        return self._poll_job(job_id, "/social/creators/comments/relevance", max_wait)
+        return self.wait_comments_relevance(resp, max_wait)
+
+    def wait_comments_relevance(self, created: Optional[dict], max_wait: float = 60) -> Optional[dict]:
+        """Poll a job returned by create_comments_relevance() until it completes."""
+        return self._wait_created(created, "/social/creators/comments/relevance", max_wait)
@@ -1,66 +1,282 @@
 """Routes incoming creator responses to the correct campaign and engagement."""
 
 import json
+import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
-# Ensure project root on path
-import sys
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
 from models.campaign import CreatorEngagement, EngagementStatus
-
+from services.json_utils import dumps
 
 def _default_tmp() -> Path:
     return Path(__file__).resolve().parent.parent / ".tmp"
 
 
+# path -> (st_mtime_ns, st_size, parsed mapping). The mapping file only
+# changes when outreach is sent, so re-parse only when it does.
+_mapping_cache: dict[Path, tuple[int, int, dict]] = {}
+_mapping_lock = threading.Lock()
+
+
 def _load_message_mapping(tmp_dir: Path) -> dict[str, dict[str, str]]:
     """Load message_id -> {campaign_id, creator_id, email} mapping."""
     path = tmp_dir / "outreach_message_ids.json"
-    if not path.exists():
-        return {}
     try:
-        return json.loads(path.read_text())
-    except json.JSONDecodeError:
+        st = path.stat()
+    except FileNotFoundError:
         return {}
+    with _mapping_lock:
+        cached = _mapping_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        try:
+            mapping = json.loads(path.read_bytes())
+        except json.JSONDecodeError:
+            return {}
+        _mapping_cache[path] = (st.st_mtime_ns, st.st_size, mapping)
+        return mapping
 
 
-def _load_engagements(tmp_dir: Path, campaign_id: str) -> dict[str, dict]:
-    """Load engagements for a campaign."""
-    path = tmp_dir / "campaign_engagements" / f"{campaign_id}.json"
-    path.parent.mkdir(parents=True, exist_ok=True)
+# Engagements live in one SQLite file per .tmp dir, one row per
+# (campaign, creator), so an ingest updates a single row instead of
+# rewriting the whole campaign. Connections are per thread (sqlite3
+# objects can't be shared across threads) and per db path.
+_ENGAGEMENTS_DB = "engagements.db"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS engagements (
+    campaign_id TEXT NOT NULL,
+    creator_id  TEXT NOT NULL,
+    json        TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, creator_id)
+)
+"""
+_OUTREACH_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS outreach (
+        email       TEXT NOT NULL,
+        campaign_id TEXT NOT NULL,
+        creator_id  TEXT NOT NULL,
+        message_id  TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS outreach_email ON outreach (email)",
+    # outreach_sent_*.json files already indexed, so a lookup miss only
+    # reads files that are new or have changed since.
+    """
+    CREATE TABLE IF NOT EXISTS outreach_files (
+        name     TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL
+    )
+    """,
+)
+# Schema changes to the outreach table, applied once per database file
+# and tracked in PRAGMA user_version. Version 1 adds sent_ns so lookups
+# pick the newest send even when older campaigns are indexed later, and
+# makes rows unique: the same send can reach record_outreach twice (live,
+# then again from its outreach_sent file). Earlier databases may already
+# hold duplicates; the first copy of each is kept.
+_OUTREACH_MIGRATION_V1 = (
+    "ALTER TABLE outreach ADD COLUMN sent_ns INTEGER NOT NULL DEFAULT 0",
+    """
+    DELETE FROM outreach WHERE rowid NOT IN (
+        SELECT MIN(rowid) FROM outreach
+        GROUP BY email, campaign_id, creator_id, IFNULL(message_id, '')
+    )
+    """,
+    """
+    CREATE UNIQUE INDEX outreach_unique
+    ON outreach (email, campaign_id, creator_id, IFNULL(message_id, ''))
+    """,
+)
+_UPSERT = """
+INSERT INTO engagements (campaign_id, creator_id, json, updated_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (campaign_id, creator_id)
+DO UPDATE SET json = excluded.json, updated_at = excluded.updated_at
+"""
+_local = threading.local()
+
+
+def _migrate_outreach(conn: sqlite3.Connection, tmp_dir: Path) -> None:
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+        return
+    with conn:
+        # Re-checked under the write lock: another thread may have won.
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        for stmt in _OUTREACH_MIGRATION_V1:
+            conn.execute(stmt)
+        # Rows already indexed carry no send time; their campaign's
+        # outreach_sent file was written right after the send.
+        now = time.time_ns()
+        campaigns = [r[0] for r in conn.execute("SELECT DISTINCT campaign_id FROM outreach")]
+        for campaign_id in campaigns:
+            try:
+                sent_ns = (tmp_dir / f"outreach_sent_{campaign_id}.json").stat().st_mtime_ns
+            except FileNotFoundError:
+                sent_ns = now
+            conn.execute("UPDATE outreach SET sent_ns = ? WHERE campaign_id = ?", (sent_ns, campaign_id))
+        conn.execute("PRAGMA user_version = 1")
+
+
+def _db(tmp_dir: Path) -> sqlite3.Connection:
+    conns: dict[Path, sqlite3.Connection] = getattr(_local, "conns", None) or {}
+    _local.conns = conns
+    conn = conns.get(tmp_dir)
+    if conn is None:
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(tmp_dir / _ENGAGEMENTS_DB, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        for stmt in _OUTREACH_SCHEMA:
+            conn.execute(stmt)
+        _migrate_outreach(conn, tmp_dir)
+        conns[tmp_dir] = conn
+    return conn
+
+
+def _legacy_engagements_path(tmp_dir: Path, campaign_id: str) -> Path:
+    return tmp_dir / "campaign_engagements" / f"{campaign_id}.json"
+
+
+def _import_legacy_engagements(tmp_dir: Path, campaign_id: str) -> dict[str, dict]:
+    """One-time migration of a pre-SQLite ``campaign_engagements/{id}.json``."""
+    path = _legacy_engagements_path(tmp_dir, campaign_id)
     if not path.exists():
         return {}
+    already = _db(tmp_dir).execute(
+        "SELECT 1 FROM engagements WHERE campaign_id = ? LIMIT 1", (campaign_id,),
+    ).fetchone()
+    if already:
+        return {}
     try:
-        data = json.loads(path.read_text())
-        return data if isinstance(data, dict) else {}
+        data = json.loads(path.read_bytes())
     except json.JSONDecodeError:
         return {}
+    if not isinstance(data, dict) or not data:
+        return {}
+    _save_engagements(tmp_dir, campaign_id, data)
+    return data
+
+
+def _load_engagements(tmp_dir: Path, campaign_id: str) -> dict[str, dict]:
+    """Load engagements for a campaign."""
+    rows = _db(tmp_dir).execute(
+        "SELECT creator_id, json FROM engagements WHERE campaign_id = ? ORDER BY rowid",
+        (campaign_id,),
+    ).fetchall()
+    if not rows:
+        return _import_legacy_engagements(tmp_dir, campaign_id)
+    return {creator_id: json.loads(data) for creator_id, data in rows}
+
+
+def _load_engagement(tmp_dir: Path, campaign_id: str, creator_id: str) -> dict:
+    """Load a single engagement row (empty dict if none)."""
+    row = _db(tmp_dir).execute(
+        "SELECT json FROM engagements WHERE campaign_id = ? AND creator_id = ?",
+        (campaign_id, creator_id),
+    ).fetchone()
+    if row is None:
+        return _import_legacy_engagements(tmp_dir, campaign_id).get(creator_id, {})
+    return json.loads(row[0])
+
+
+def _save_engagement(tmp_dir: Path, campaign_id: str, creator_id: str, engagement: dict) -> None:
+    """Upsert a single engagement row."""
+    now = datetime.now(timezone.utc).isoformat()
+    _db(tmp_dir).execute(_UPSERT, (campaign_id, creator_id, dumps(engagement), now))
 
 
 def _save_engagements(tmp_dir: Path, campaign_id: str, engagements: dict[str, dict]) -> None:
     """Persist engagements for a campaign."""
-    path = tmp_dir / "campaign_engagements" / f"{campaign_id}.json"
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(engagements, indent=2))
+    now = datetime.now(timezone.utc).isoformat()
+    conn = _db(tmp_dir)
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            _UPSERT,
+            [(campaign_id, cid, dumps(eng), now) for cid, eng in engagements.items()],
+        )
 
 
-def _lookup_by_email(tmp_dir: Path, from_email: str) -> Optional[tuple[str, str]]:
-    """Find (campaign_id, creator_id) by creator email from outreach_sent files."""
-    sent_dir = tmp_dir
-    for f in sent_dir.glob("outreach_sent_*.json"):
+def record_outreach(
+    tmp_dir: Path,
+    campaign_id: str,
+    messages: list[dict],
+    sent_ns: Optional[int] = None,
+) -> None:
+    """Index sent outreach by recipient email for reply routing."""
+    sent_ns = sent_ns or time.time_ns()
+    rows = [
+        (m["email"].lower().strip(), campaign_id, str(m.get("creator_id", "")), m.get("message_id"), sent_ns)
+        for m in messages
+        if m.get("email")
+    ]
+    if not rows:
+        return
+    conn = _db(tmp_dir)
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR IGNORE INTO outreach (email, campaign_id, creator_id, message_id, sent_ns)"
+            " VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _backfill_outreach_index(tmp_dir: Path) -> bool:
+    """Index ``outreach_sent_*.json`` files not yet in the outreach table.
+
+    Covers campaigns sent before the table existed. Their rows are indexed
+    with the file's mtime as their send time. Returns whether anything new
+    was read.
+    """
+    conn = _db(tmp_dir)
+    seen = dict(conn.execute("SELECT name, mtime_ns FROM outreach_files").fetchall())
+    pending = []
+    for f in tmp_dir.glob("outreach_sent_*.json"):
         try:
-            data = json.loads(f.read_text())
-            messages = data.get("messages", [])
-            for m in messages:
-                if (m.get("email") or "").lower().strip() == from_email.lower().strip():
-                    campaign_id = f.stem.replace("outreach_sent_", "")
-                    return (campaign_id, m.get("creator_id", ""))
-        except (json.JSONDecodeError, KeyError):
+            mtime_ns = f.stat().st_mtime_ns
+        except FileNotFoundError:
             continue
-    return None
+        if seen.get(f.name) != mtime_ns:
+            pending.append((mtime_ns, f))
+    for mtime_ns, f in pending:
+        try:
+            data = json.loads(f.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        campaign_id = f.stem.replace("outreach_sent_", "")
+        record_outreach(tmp_dir, campaign_id, data.get("messages", []), mtime_ns)
+        conn.execute(
+            "INSERT OR REPLACE INTO outreach_files (name, mtime_ns) VALUES (?, ?)",
+            (f.name, mtime_ns),
+        )
+    return bool(pending)
+
+
+def _lookup_by_email(tmp_dir: Path, from_email: str) -> Optional[tuple[str, str]]:
+    """Find (campaign_id, creator_id) for the most recent outreach to this email.
+
+    Live sends are indexed as they go out; on a miss, outreach_sent files
+    not yet indexed (older campaigns) are read in and the lookup retried.
+    """
+    conn = _db(tmp_dir)
+    email = from_email.lower().strip()
+    query = (
+        "SELECT campaign_id, creator_id FROM outreach WHERE email = ?"
+        " ORDER BY sent_ns DESC, rowid DESC LIMIT 1"
+    )
+    row = conn.execute(query, (email,)).fetchone()
+    if row is None and _backfill_outreach_index(tmp_dir):
+        row = conn.execute(query, (email,)).fetchone()
+    return (row[0], row[1]) if row else None
 
 
 def ingest_response(
@@ -108,29 +324,33 @@ def ingest_response(
             "error": "Could not resolve campaign/creator from message_id or from_email",
         }
 
-    engagements = _load_engagements(tmp, campaign_id)
     cid = str(creator_id)
-    raw = engagements.get(cid, {})
-    eng = CreatorEngagement(
-        creator_id=cid,
-        status=EngagementStatus(raw.get("status", "responded")),
-        latest_proposal=raw.get("latest_proposal"),
-        terms=raw.get("terms"),
-        message_history=list(raw.get("message_history", [])),
-        response_timestamp=raw.get("response_timestamp"),
-        notes=raw.get("notes"),
-    )
+    raw = _load_engagement(tmp, campaign_id, cid)
+    message = {"from": "creator", "body": body, "timestamp": ts}
 
-    eng.message_history.append({
-        "from": "creator",
-        "body": body,
-        "timestamp": ts,
-    })
-    eng.response_timestamp = ts
-    eng.status = EngagementStatus.RESPONDED
+    if raw.get("creator_id") == cid and isinstance(raw.get("message_history"), list):
+        # Existing row — it was written from model_dump(), so update it in
+        # place rather than re-validating the whole engagement.
+        raw["message_history"].append(message)
+        raw["response_timestamp"] = ts
+        raw["status"] = EngagementStatus.RESPONDED.value
+        engagement = raw
+    else:
+        eng = CreatorEngagement(
+            creator_id=cid,
+            status=EngagementStatus(raw.get("status", "responded")),
+            latest_proposal=raw.get("latest_proposal"),
+            terms=raw.get("terms"),
+            message_history=list(raw.get("message_history") or []),
+            response_timestamp=raw.get("response_timestamp"),
+            notes=raw.get("notes"),
+        )
+        eng.message_history.append(message)
+        eng.response_timestamp = ts
+        eng.status = EngagementStatus.RESPONDED
+        engagement = eng.model_dump(mode="json")
 
-    engagements[cid] = eng.model_dump()
-    _save_engagements(tmp, campaign_id, engagements)
+    _save_engagement(tmp, campaign_id, cid, engagement)
 
     # Persist to Supabase (non-fatal — .tmp is primary for agent)
     try:
@@ -167,5 +387,5 @@ def ingest_response(
         "success": True,
         "campaign_id": campaign_id,
         "creator_id": cid,
-        "engagement": eng.model_dump(),
+        "engagement": engagement,
     }
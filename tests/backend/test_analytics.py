@@ -1,19 +1,33 @@
 """Tests for the aggregate analytics dashboard endpoint."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-# Patch targets — the inline imports within analytics_dashboard resolve to repo modules
+# Patch targets — the inline imports within analytics_dashboard resolve to repo
+# modules, so setattr on the module is picked up on the next request.
+# The dashboard fetches each source once for all campaigns via *_batch helpers
+# that return {campaign_id: payload}.
 CAMP_REPO = "backend.db.repositories.campaign_repo"
 EMAIL_REPO = "backend.db.repositories.email_event_repo"
 ENG_REPO = "backend.db.repositories.engagement_repo"
 MON_REPO = "backend.db.repositories.monitor_repo"
 
 
+@pytest.fixture(autouse=True)
+def _clear_dashboard_cache():
+    """The route caches the aggregate per brand; each test needs a cold cache."""
+    from backend.cache import dashboard_cache
+    dashboard_cache.clear()
+    yield
+    dashboard_cache.clear()
+
+
 def _mock_campaigns():
     return [
-        {"id": "cmp-1", "name": "Campaign Alpha", "status": "completed", "created_at": "2025-01-01T00:00:00Z"},
-        {"id": "cmp-2", "name": "Campaign Beta", "status": "running", "created_at": "2025-01-15T00:00:00Z"},
+        {"id": "cmp-1", "name": "Campaign Alpha", "status": "completed", "created_at": "2025-01-01T00:00:00Z",
+         "brief": {"budget_gbp": 2000, "brand_name": "Alpha"}},
+        {"id": "cmp-2", "name": "Campaign Beta", "status": "running", "created_at": "2025-01-15T00:00:00Z",
+         "brief": {"budget_gbp": 1000, "brand_name": "Beta"}},
     ]
 
 
@@ -28,41 +42,29 @@ def _mock_email_summary(sent=5, delivered=4, opened=3, clicked=1, bounced=0):
     }
 
 
+# Built once; the route only reads engagement rows.
+_CMP1_ENGS = [
+    {
+        "id": "eng-1", "campaign_id": "cmp-1", "creator_id": "cr-1",
+        "creator_name": "Alice", "creator_email": "alice@test.com",
+        "platform": "instagram", "status": "agreed",
+        "terms": {"fee_gbp": 500}, "latest_proposal": None,
+        "message_history": [], "response_timestamp": "2025-01-02T12:00:00Z",
+        "created_at": "2025-01-01T12:00:00Z", "updated_at": "2025-01-02T12:00:00Z",
+    },
+    {
+        "id": "eng-2", "campaign_id": "cmp-1", "creator_id": "cr-2",
+        "creator_name": "Bob", "creator_email": "bob@test.com",
+        "platform": "tiktok", "status": "contacted",
+        "terms": None, "latest_proposal": None,
+        "message_history": [], "response_timestamp": None,
+        "created_at": "2025-01-01T12:00:00Z", "updated_at": "2025-01-01T12:00:00Z",
+    },
+]
+
+
 def _mock_engagements(campaign_id):
-    if campaign_id == "cmp-1":
-        return [
-            {
-                "id": "eng-1", "campaign_id": "cmp-1", "creator_id": "cr-1",
-                "creator_name": "Alice", "creator_email": "alice@test.com",
-                "platform": "instagram", "status": "agreed",
-                "terms": {"fee_gbp": 500}, "latest_proposal": None,
-                "message_history": [], "response_timestamp": "2025-01-02T12:00:00Z",
-                "created_at": "2025-01-01T12:00:00Z", "updated_at": "2025-01-02T12:00:00Z",
-            },
-            {
-                "id": "eng-2", "campaign_id": "cmp-1", "creator_id": "cr-2",
-                "creator_name": "Bob", "creator_email": "bob@test.com",
-                "platform": "tiktok", "status": "contacted",
-                "terms": None, "latest_proposal": None,
-                "message_history": [], "response_timestamp": None,
-                "created_at": "2025-01-01T12:00:00Z", "updated_at": "2025-01-01T12:00:00Z",
-            },
-        ]
-    return []
-
-
-def _mock_campaign_detail(campaign_id, brand_id=None):
-    if campaign_id == "cmp-1":
-        return {
-            "id": "cmp-1", "name": "Campaign Alpha", "status": "completed",
-            "brief": {"budget_gbp": 2000, "brand_name": "Alpha"},
-        }
-    if campaign_id == "cmp-2":
-        return {
-            "id": "cmp-2", "name": "Campaign Beta", "status": "running",
-            "brief": {"budget_gbp": 1000, "brand_name": "Beta"},
-        }
-    return None
+    return _CMP1_ENGS if campaign_id == "cmp-1" else []
 
 
 def _mock_monitor_summary(campaign_id):
@@ -75,97 +77,196 @@ def _mock_monitor_summary(campaign_id):
     return {}
 
 
-def test_dashboard_returns_aggregated_data(client):
+def _batch(fn):
+    """Wrap a per-campaign mock as a {campaign_id: payload} batch side_effect."""
+    def _side_effect(campaign_ids, *a, **kw):
+        out = {cid: fn(cid) for cid in campaign_ids}
+        return {cid: v for cid, v in out.items() if v}
+    return _side_effect
+
+
+def _raise_db_error(*a, **kw):
+    raise Exception("db error")
+
+
+@pytest.fixture()
+def analytics_mocks(monkeypatch):
+    """Point the dashboard's repo calls at the mock data above.
+
+    Tests override individual sources with ``monkeypatch.setattr`` as needed.
+    """
+    monkeypatch.setattr(f"{CAMP_REPO}.list_campaigns", lambda *a, **kw: _mock_campaigns())
+    monkeypatch.setattr(
+        f"{EMAIL_REPO}.get_delivery_counts_batch",
+        lambda ids: {cid: _mock_email_summary() for cid in ids},
+    )
+    monkeypatch.setattr(f"{ENG_REPO}.get_engagements_batch", _batch(_mock_engagements))
+    monkeypatch.setattr(f"{MON_REPO}.get_monitor_summary_batch", _batch(_mock_monitor_summary))
+    return monkeypatch
+
+
+@pytest.fixture()
+def dashboard_data(client, analytics_mocks):
+    """Dashboard response over the default mocks, for the table tests below."""
+    res = client.get("/api/analytics/dashboard")
+    assert res.status_code == 200
+    return res.json()
+
+
+def _resolve(data, path):
+    """Follow a dotted path; integer segments index into lists."""
+    for key in path.split("."):
+        data = data[int(key)] if key.isdigit() else data[key]
+    return data
+
+
+@pytest.mark.parametrize("path,expected", [
+    # Top-level aggregates
+    ("totalCampaigns", 2),
+    ("totalCreatorsContacted", 2),
+    ("totalAgreed", 1),
+    ("totalDeclined", 0),
+    ("responseRate", 50),  # 1 responded out of 2
+    ("conversionRate", 50),  # 1 agreed out of 2
+    # Email stats
+    ("emailStats.totalSent", 10),  # 5 per campaign * 2
+    ("emailStats.openRate", 60),
+    # Per-campaign breakdown
+    ("perCampaign.0.id", "cmp-1"),
+    # All creators
+    ("allCreators.0.name", "Alice"),
+    ("allCreators.0.agreed", True),
+    ("allCreators.0.feeGbp", 500),
+    # Engagement funnel
+    ("engagementFunnel.agreed", 1),
+    ("engagementFunnel.contacted", 1),
+    # Content performance
+    ("contentPerformance.totalPostsLive", 2),
+    ("contentPerformance.totalLikes", 300),
+    ("contentPerformance.avgComplianceScore", 85.0),
+    # Budget tracking
+    ("budgetTracking.totalBudget", 3000),  # 2000 + 1000
+    ("budgetTracking.totalAgreedFees", 500),
+    ("budgetTracking.avgCostPerCreator", 500),
+])
+def test_dashboard_returns_aggregated_data(dashboard_data, path, expected):
     """GET /api/analytics/dashboard returns complete aggregated analytics."""
-    with patch(f"{CAMP_REPO}.list_campaigns", return_value=_mock_campaigns()), \
-         patch(f"{CAMP_REPO}.get_campaign", side_effect=_mock_campaign_detail), \
-         patch(f"{EMAIL_REPO}.get_delivery_summary", return_value=_mock_email_summary()), \
-         patch(f"{ENG_REPO}.get_engagements", side_effect=_mock_engagements), \
-         patch(f"{MON_REPO}.get_monitor_summary", side_effect=_mock_monitor_summary):
-        res = client.get("/api/analytics/dashboard")
-        assert res.status_code == 200
-        data = res.json()
-
-        # Top-level aggregates
-        assert data["totalCampaigns"] == 2
-        assert data["totalCreatorsContacted"] == 2
-        assert data["totalAgreed"] == 1
-        assert data["totalDeclined"] == 0
-        assert data["responseRate"] == 50  # 1 responded out of 2
-        assert data["conversionRate"] == 50  # 1 agreed out of 2
-
-        # Email stats
-        assert data["emailStats"]["totalSent"] == 10  # 5 per campaign * 2
-        assert data["emailStats"]["openRate"] > 0
-
-        # Per-campaign breakdown
-        assert len(data["perCampaign"]) == 2
-        assert data["perCampaign"][0]["id"] == "cmp-1"
-
-        # All creators
-        assert len(data["allCreators"]) == 2
-        assert data["allCreators"][0]["name"] == "Alice"
-        assert data["allCreators"][0]["agreed"] is True
-        assert data["allCreators"][0]["feeGbp"] == 500
-
-        # Engagement funnel
-        assert data["engagementFunnel"]["agreed"] == 1
-        assert data["engagementFunnel"]["contacted"] == 1
-
-        # Platform breakdown
-        assert len(data["platformBreakdown"]) == 2
-
-        # Content performance
-        assert data["contentPerformance"]["totalPostsLive"] == 2
-        assert data["contentPerformance"]["totalLikes"] == 300
-        assert data["contentPerformance"]["avgComplianceScore"] == 85.0
-
-        # Budget tracking
-        assert data["budgetTracking"]["totalBudget"] == 3000  # 2000 + 1000
-        assert data["budgetTracking"]["totalAgreedFees"] == 500
-        assert data["budgetTracking"]["avgCostPerCreator"] == 500
-
-
-def test_dashboard_empty_campaigns(client):
+    assert _resolve(dashboard_data, path) == expected
+
+
+@pytest.mark.parametrize("path,length", [
+    ("perCampaign", 2),
+    ("allCreators", 2),
+    ("platformBreakdown", 2),
+])
+def test_dashboard_breakdown_sizes(dashboard_data, path, length):
+    """Breakdown lists hold one entry per campaign, creator and platform."""
+    assert len(_resolve(dashboard_data, path)) == length
+
+
+def test_dashboard_empty_campaigns(client, analytics_mocks):
     """GET /api/analytics/dashboard returns zeroed data when no campaigns exist."""
-    with patch(f"{CAMP_REPO}.list_campaigns", return_value=[]):
-        res = client.get("/api/analytics/dashboard")
-        assert res.status_code == 200
-        data = res.json()
-        assert data["totalCampaigns"] == 0
-        assert data["totalCreatorsContacted"] == 0
-        assert data["perCampaign"] == []
-        assert data["allCreators"] == []
-        assert data["contentPerformance"]["totalPostsLive"] == 0
-        assert data["budgetTracking"]["totalBudget"] == 0
-
-
-def test_dashboard_handles_repo_errors(client):
+    analytics_mocks.setattr(f"{CAMP_REPO}.list_campaigns", lambda *a, **kw: [])
+    res = client.get("/api/analytics/dashboard")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["totalCampaigns"] == 0
+    assert data["totalCreatorsContacted"] == 0
+    assert data["perCampaign"] == []
+    assert data["allCreators"] == []
+    assert data["contentPerformance"]["totalPostsLive"] == 0
+    assert data["budgetTracking"]["totalBudget"] == 0
+
+
+def test_dashboard_handles_repo_errors(client, analytics_mocks):
     """GET /api/analytics/dashboard handles errors in individual repo calls gracefully."""
-    with patch(f"{CAMP_REPO}.list_campaigns", return_value=_mock_campaigns()), \
-         patch(f"{CAMP_REPO}.get_campaign", side_effect=Exception("db error")), \
-         patch(f"{EMAIL_REPO}.get_delivery_summary", side_effect=Exception("db error")), \
-         patch(f"{ENG_REPO}.get_engagements", side_effect=Exception("db error")), \
-         patch(f"{MON_REPO}.get_monitor_summary", side_effect=Exception("db error")):
-        res = client.get("/api/analytics/dashboard")
-        assert res.status_code == 200
-        data = res.json()
-        # Should still return structure even if all per-campaign queries fail
-        assert data["totalCampaigns"] == 2
-        assert data["totalCreatorsContacted"] == 0
-        assert data["emailStats"]["totalSent"] == 0
-
-
-def test_dashboard_email_breakdown(client):
+    analytics_mocks.setattr(f"{EMAIL_REPO}.get_delivery_counts_batch", _raise_db_error)
+    analytics_mocks.setattr(f"{ENG_REPO}.get_engagements_batch", _raise_db_error)
+    analytics_mocks.setattr(f"{MON_REPO}.get_monitor_summary_batch", _raise_db_error)
+    res = client.get("/api/analytics/dashboard")
+    assert res.status_code == 200
+    data = res.json()
+    # Should still return structure even if all per-campaign queries fail
+    assert data["totalCampaigns"] == 2
+    assert data["totalCreatorsContacted"] == 0
+    assert data["emailStats"]["totalSent"] == 0
+
+
+def test_dashboard_email_breakdown(client, analytics_mocks):
     """Email breakdown contains per-campaign data."""
-    with patch(f"{CAMP_REPO}.list_campaigns", return_value=_mock_campaigns()), \
-         patch(f"{CAMP_REPO}.get_campaign", side_effect=_mock_campaign_detail), \
-         patch(f"{EMAIL_REPO}.get_delivery_summary", return_value=_mock_email_summary(sent=10, opened=8)), \
-         patch(f"{ENG_REPO}.get_engagements", return_value=[]), \
-         patch(f"{MON_REPO}.get_monitor_summary", return_value={}):
-        res = client.get("/api/analytics/dashboard")
-        assert res.status_code == 200
-        data = res.json()
-        assert len(data["emailBreakdown"]) == 2
-        assert data["emailBreakdown"][0]["sent"] == 10
-        assert data["emailBreakdown"][0]["opened"] == 8
+    analytics_mocks.setattr(
+        f"{EMAIL_REPO}.get_delivery_counts_batch",
+        lambda ids: {cid: _mock_email_summary(sent=10, opened=8) for cid in ids},
+    )
+    analytics_mocks.setattr(f"{ENG_REPO}.get_engagements_batch", lambda ids: {})
+    analytics_mocks.setattr(f"{MON_REPO}.get_monitor_summary_batch", lambda ids: {})
+    res = client.get("/api/analytics/dashboard")
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["emailBreakdown"]) == 2
+    assert data["emailBreakdown"][0]["sent"] == 10
+    assert data["emailBreakdown"][0]["opened"] == 8
+
+
+def test_dashboard_serves_repeat_requests_from_cache(client):
+    """A second request within the TTL reuses the aggregate without re-querying."""
+    with patch(f"{CAMP_REPO}.list_campaigns", return_value=[]) as mock_list:
+        assert client.get("/api/analytics/dashboard").status_code == 200
+        assert client.get("/api/analytics/dashboard").status_code == 200
+        assert mock_list.call_count == 1
+
+
+def test_delivery_counts_batch_maps_rpc_rows(mock_sb):
+    """get_delivery_counts_batch turns email_delivery_counts rows into summaries."""
+    from backend.db.repositories.email_event_repo import get_delivery_counts_batch
+
+    mock_sb._rpc_results["email_delivery_counts"] = [
+        {"campaign_id": "cmp-1", "total_sent": 3, "delivered": 3, "opened": 2, "clicked": 1, "bounced": 0},
+    ]
+    with patch(f"{EMAIL_REPO}.get_supabase", return_value=mock_sb):
+        out = get_delivery_counts_batch(["cmp-1", "cmp-2"])
+    assert out == {"cmp-1": _mock_email_summary(sent=3, delivered=3, opened=2, clicked=1)}
+
+
+def test_delivery_summary_batch_reads_every_page(mock_sb):
+    """The event-scan fallback keeps paging past the first .range() window."""
+    from functools import partial
+    from backend.db.client import select_all
+    from backend.db.repositories.email_event_repo import get_delivery_summary_batch
+
+    mock_sb.seed_table("email_events", [
+        {"id": "e1", "campaign_id": "cmp-1", "creator_id": "c1", "event_type": "sent"},
+        {"id": "e2", "campaign_id": "cmp-1", "creator_id": "c1", "event_type": "delivered"},
+        {"id": "e3", "campaign_id": "cmp-2", "creator_id": "c2", "event_type": "sent"},
+    ])
+    events = mock_sb.table("email_events")
+    events.range = lambda start, end: type(events)(events._data[start:end + 1])
+    with patch(f"{EMAIL_REPO}.get_supabase", return_value=mock_sb), \
+         patch(f"{EMAIL_REPO}.select_all", partial(select_all, page_size=2)):
+        out = get_delivery_summary_batch(["cmp-1", "cmp-2"])
+    assert out["cmp-1"]["delivered"] == 1
+    assert out["cmp-2"]["total_sent"] == 1
+
+
+@pytest.fixture()
+def fresh_llm_client():
+    """Start and end with no shared Anthropic client or cached key check."""
+    from tools import analytics
+    analytics.reset_llm_client()
+    yield analytics
+    analytics.reset_llm_client()
+
+
+def test_analytics_tool_rechecks_api_key_after_reset(fresh_llm_client, monkeypatch):
+    """The API-key check is cached until reset_llm_client() is called."""
+    analytics = fresh_llm_client
+    monkeypatch.setattr(analytics, "_load_dotenv_once", lambda: None)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "")
+    assert analytics.AnalyticsTool()._get_client() is None
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    assert analytics.AnalyticsTool()._get_client() is None
+    analytics.reset_llm_client()
+    client = analytics.AnalyticsTool()._get_client()
+    assert client is not None
+    assert analytics.AnalyticsTool()._get_client() is client
@@ -1,7 +1,10 @@
 """Approval API route tests."""
 
+import json
 from unittest.mock import patch
 
+from postgrest.exceptions import APIError
+
 R = "backend.api.routes.approvals"
 
 
@@ -14,15 +17,14 @@ def test_approvals_status(client):
 
 def test_list_pending_approvals(client, auth_brand):
     """GET /api/approvals/pending returns only brand's pending approvals."""
-    campaign = {"id": "c1", "brand_id": auth_brand["id"]}
     pending = [
         {"id": "a1", "campaign_id": "c1", "status": "pending", "approval_type": "strategy"},
     ]
-    with patch(f"{R}.repo_pending", return_value=pending), \
-         patch(f"{R}.repo_get_campaign", return_value=campaign):
+    with patch(f"{R}.repo_pending_for_brand", return_value=pending) as mock_pending:
         res = client.get("/api/approvals/pending")
     assert res.status_code == 200
     assert len(res.json()) == 1
+    mock_pending.assert_called_once_with(auth_brand["id"])
 
 
 def test_campaign_approvals(client, auth_brand):
@@ -75,3 +77,140 @@ def test_create_approval_missing_fields(client, auth_brand):
             # missing payload
         })
     assert res.status_code == 400
+
+
+def test_decide_approval_wakes_waiter(mock_sb):
+    """decide_approval() sets the in-process event a WebApprovalTool waits on."""
+    from backend.db.repositories import approval_repo
+
+    mock_sb.seed_table("approvals", [{"id": "a1", "status": "pending"}])
+    event = approval_repo.decision_event("a1")
+    try:
+        with patch.object(approval_repo, "get_supabase", return_value=mock_sb):
+            assert approval_repo.decide_approval("a1", "approved") is True
+        assert event.is_set()
+    finally:
+        approval_repo.discard_decision_event("a1")
+
+
+def test_create_approval_and_mark_waiting_uses_rpc(mock_sb):
+    """One RPC creates the approval and parks the campaign."""
+    from backend.db.repositories import approval_repo
+
+    mock_sb._rpc_results["create_approval_and_mark_waiting"] = ["appr-1"]
+    with patch.object(approval_repo, "get_supabase", return_value=mock_sb):
+        aid = approval_repo.create_approval_and_mark_waiting(
+            "cmp-1", "strategy", {"a": 1}, agent_state="strategy_draft",
+        )
+    assert aid == "appr-1"
+
+
+def test_create_approval_and_mark_waiting_falls_back(mock_sb, monkeypatch):
+    """Without migration 016 it inserts the approval and updates the campaign."""
+    from backend.db.repositories import approval_repo
+
+    def _missing_rpc(*a, **kw):
+        raise APIError({"code": "PGRST202", "message": "Could not find the function"})
+
+    monkeypatch.setattr(mock_sb, "rpc", _missing_rpc)
+    updates = []
+    monkeypatch.setattr(approval_repo.campaign_repo, "update_campaign", lambda cid, u: updates.append((cid, u)))
+    with patch.object(approval_repo, "get_supabase", return_value=mock_sb):
+        aid = approval_repo.create_approval_and_mark_waiting("cmp-1", "strategy", {})
+    assert aid == "mock-uuid-1234"
+    assert updates == [("cmp-1", {"status": "awaiting_approval"})]
+
+
+def test_create_approval_and_mark_waiting_no_fallback_on_other_errors(mock_sb, monkeypatch):
+    """A failure that may have committed doesn't insert a second approval."""
+    from backend.db.repositories import approval_repo
+
+    def _timeout(*a, **kw):
+        raise TimeoutError("read timed out")
+
+    monkeypatch.setattr(mock_sb, "rpc", _timeout)
+    inserts = []
+    monkeypatch.setattr(approval_repo, "create_approval", lambda *a, **kw: inserts.append(a))
+    with patch.object(approval_repo, "get_supabase", return_value=mock_sb):
+        assert approval_repo.create_approval_and_mark_waiting("cmp-1", "strategy", {}) is None
+    assert inserts == []
+
+
+def test_cli_approval_not_reused_once_decided(tmp_path, monkeypatch):
+    """An approved pending file doesn't grant the next request of that type."""
+    from models.actions import AgentAction, AgentActionType
+    from models.context import CampaignContext
+    from tools.approval import ApprovalTool
+
+    tool = ApprovalTool(output_dir=tmp_path)
+    ctx = CampaignContext(campaign_id="c1")
+    action = AgentAction(
+        type=AgentActionType.REQUEST_APPROVAL,
+        input={"approval_type": "outreach", "subject": "Outreach approval"},
+    )
+    path = tmp_path / "pending_approval_c1.json"
+
+    def _approve_via_file(*a):
+        path.write_text(json.dumps({**json.loads(path.read_text()), "status": "approved"}))
+        return None
+
+    monkeypatch.setattr(tool, "_prompt_decision", _approve_via_file)
+    assert tool.request_approval(ctx, action).output["approval_granted"] is True
+
+    monkeypatch.setattr(tool, "_prompt_decision", lambda *a: "n")
+    monkeypatch.setattr("builtins.input", lambda *a: "")
+    assert tool.request_approval(ctx, action).output["approval_granted"] is False
+
+
+def test_cli_approval_status_pending_while_file_is_rewritten(tmp_path):
+    """A file caught mid-write reads as pending and isn't cached."""
+    from tools.approval import ApprovalTool
+
+    tool = ApprovalTool(output_dir=tmp_path)
+    path = tmp_path / "pending_approval_c1.json"
+    path.write_text("")
+    assert tool.check_approval_status("r1", "c1") == "pending"
+    path.write_text('{"status": "appr')
+    assert tool.check_approval_status("r1", "c1") == "pending"
+    path.write_text('{"status": "approved"}')
+    assert tool.check_approval_status("r1", "c1") == "approved"
+
+
+def test_web_approval_timeout_closes_approval_and_stops_agent(mock_sb, monkeypatch):
+    """A timed-out approval is closed as rejected and ends the agent loop."""
+    from agent.hudey_agent import HudeyAgent
+    from models.actions import AgentAction, AgentActionType
+    from models.brief import CampaignBrief
+    from tools import approval
+
+    decisions = []
+    monkeypatch.setattr(approval, "create_approval_and_mark_waiting", lambda **kw: "appr-1")
+    monkeypatch.setattr(approval, "get_approval", lambda aid: {"id": aid, "status": "pending"})
+    monkeypatch.setattr(approval, "decide_approval", lambda *a: decisions.append(a))
+    tool = approval.WebApprovalTool("cmp-1", max_wait_seconds=0)
+
+    asks = []
+
+    def _reason(context):
+        asks.append(context.state)
+        return AgentAction(
+            type=AgentActionType.REQUEST_APPROVAL,
+            input={"approval_type": "strategy"},
+            requires_approval=True,
+        )
+
+    agent = HudeyAgent.__new__(HudeyAgent)
+    agent.approval = tool
+    monkeypatch.setattr(agent, "reason", _reason, raising=False)
+    monkeypatch.setattr(agent, "update_memory", lambda *a: None, raising=False)
+    brief = CampaignBrief(
+        brand_name="Acme", objective="o", target_audience="a", platforms=["instagram"],
+        follower_range=(1000, 10000), budget_gbp=100, deliverables=["post"],
+        key_message="m", timeline="t",
+    )
+
+    context = agent.execute_campaign(brief, approve_all=False)
+
+    assert not context.is_complete
+    assert len(asks) == 1  # not asked again after the timeout
+    assert decisions[0][:2] == ("appr-1", "rejected")
@@ -0,0 +1,126 @@
+"""Tests for the post-analysis cache, resume journal and report write in campaign_insights.py."""
+
+import json
+
+import pytest
+
+from models.actions import AgentAction, AgentActionType
+from models.brief import CampaignBrief
+from models.campaign import Creator
+from models.context import CampaignContext
+from tools import campaign_insights as ci
+from tools.campaign_insights import CampaignInsightsTool, _analysis_key, _read_journal
+
+
+def _analysis(content_id="post-1"):
+    return {
+        "content_id": content_id,
+        "product_name": "Acme",
+        "purchase_intent": {"score": 70},
+        "comments_relevance": {"relevance_percentage": 40},
+    }
+
+
+def test_analysis_key_normalises_product_text():
+    """Case and whitespace in the product text map to the same key."""
+    key = _analysis_key("post-1", "Acme  Shoes", " Light\nRunners ")
+    assert key == _analysis_key("post-1", "acme shoes", "light runners")
+    assert key != _analysis_key("post-2", "acme shoes", "light runners")
+    assert key != _analysis_key("post-1", "acme boots", "light runners")
+
+
+def test_cache_expires_after_ttl(tmp_path, monkeypatch):
+    """Cached analyses are served for a week, then treated as misses."""
+    tool = CampaignInsightsTool(output_dir=tmp_path)
+    now = 1_700_000_000
+    monkeypatch.setattr(ci.time, "time", lambda: now)
+    tool._cache_put("k", _analysis())
+    assert tool._cache_get("k") == _analysis()
+    assert tool._cache_get("other") is None
+
+    monkeypatch.setattr(ci.time, "time", lambda: now + ci._CACHE_TTL_SECONDS - 1)
+    assert tool._cache_get("k") is not None
+    monkeypatch.setattr(ci.time, "time", lambda: now + ci._CACHE_TTL_SECONDS)
+    assert tool._cache_get("k") is None
+
+
+def test_analyze_post_served_from_cache(tmp_path):
+    """A cache hit skips InsightIQ and echoes the caller's product name."""
+    tool = CampaignInsightsTool(output_dir=tmp_path)
+    tool._cache_put(_analysis_key("post-1", "Acme", ""), _analysis())
+    tool._phyllo = object()  # any InsightIQ call would fail
+
+    result = tool.analyze_post("post-1", " ACME ")
+    assert result["purchase_intent"] == {"score": 70}
+    assert result["product_name"] == " ACME "
+
+
+def _journal_line(result, product="Acme", description="", written_at=None, key=True):
+    entry = {"written_at": written_at, "result": result}
+    if key:
+        entry["key"] = _analysis_key(result["content_id"], product, description)
+    return json.dumps(entry) + "\n"
+
+
+def test_read_journal_skips_other_products_and_stale_lines(tmp_path, monkeypatch):
+    """Only fresh lines keyed to this product text are resumed."""
+    now = 1_700_000_000
+    monkeypatch.setattr(ci.time, "time", lambda: now)
+    path = tmp_path / "campaign_insights_c1.jsonl"
+    path.write_text(
+        _journal_line(_analysis("fresh"), written_at=now - 60)
+        + _journal_line(_analysis("other-product"), product="Globex", written_at=now)
+        + _journal_line(_analysis("stale"), written_at=now - ci._CACHE_TTL_SECONDS - 1)
+        + _journal_line(_analysis("unkeyed"), written_at=now, key=False)
+        + '{"key": "torn'
+    )
+
+    assert list(_read_journal(path, "ACME", "")) == ["fresh"]
+    assert _read_journal(tmp_path / "missing.jsonl", "Acme", "") == {}
+
+
+@pytest.fixture()
+def insights_run(tmp_path, mock_sb, monkeypatch):
+    """Run execute() with canned post analyses; mock_sb absorbs the DB writes."""
+    tool = CampaignInsightsTool(output_dir=tmp_path)
+    monkeypatch.setattr(tool, "analyze_campaign_posts", lambda **kw: [
+        {**_analysis(), "creator_username": "alice"},
+    ])
+    brief = CampaignBrief(
+        brand_name="Acme", objective="o", target_audience="a", platforms=["instagram"],
+        follower_range=(1000, 10000), budget_gbp=100, deliverables=["post"],
+        key_message="m", timeline="t",
+    )
+    ctx = CampaignContext(
+        campaign_id="c1",
+        brief=brief,
+        creators=[Creator(username="alice", platform="instagram", follower_count=1000)],
+    )
+
+    def run():
+        result = tool.execute(ctx, AgentAction(type=AgentActionType.MONITOR_CAMPAIGN))
+        assert result.success, result.error
+        return tmp_path / "campaign_insights_c1.json"
+
+    return run
+
+
+def test_execute_writes_compact_report_atomically(insights_run, monkeypatch):
+    """The report is written compact by default and leaves no temp file."""
+    monkeypatch.delenv("HUDEY_PRETTY_JSON", raising=False)
+    path = insights_run()
+
+    text = path.read_text()
+    assert "\n" not in text and ": " not in text
+    report = json.loads(text)
+    assert report["campaign_id"] == "c1"
+    assert report["posts"][0]["creator_username"] == "alice"
+    assert report["summary"]["posts_analyzed"] == 1
+    assert list(path.parent.glob("*.tmp")) == []
+
+
+def test_execute_pretty_report(insights_run, monkeypatch):
+    """HUDEY_PRETTY_JSON=1 indents the report for debugging."""
+    monkeypatch.setenv("HUDEY_PRETTY_JSON", "1")
+    path = insights_run()
+    assert path.read_text().startswith('{\n  "campaign_id": "c1"')
@@ -0,0 +1,79 @@
+"""Campaign repository tests — read cache and write-through invalidation."""
+
+CAMPAIGN_UUID = "11111111-2222-3333-4444-555555555555"
+
+
+def test_get_campaign_serves_repeat_reads_from_cache(mock_sb):
+    """A second get_campaign() within the TTL does not re-query the table."""
+    from backend.db.repositories.campaign_repo import get_campaign
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "short_id": "abc", "status": "running"}])
+    assert get_campaign(CAMPAIGN_UUID)["status"] == "running"
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "short_id": "abc", "status": "completed"}])
+    assert get_campaign(CAMPAIGN_UUID)["status"] == "running"
+    # Cached under the short_id as well
+    assert get_campaign("abc")["status"] == "running"
+
+
+def test_update_campaign_invalidates_cache(mock_sb):
+    """update_campaign() drops the cached row so the next read is fresh."""
+    from backend.db.repositories.campaign_repo import get_campaign, update_campaign
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "short_id": "abc", "status": "running"}])
+    get_campaign("abc")
+
+    assert update_campaign("abc", {"status": "completed"}) is True
+    assert get_campaign(CAMPAIGN_UUID)["status"] == "completed"
+    assert get_campaign("abc")["status"] == "completed"
+
+
+def test_brand_check_applies_to_cached_rows(mock_sb):
+    """Ownership is still verified when the row comes from the cache."""
+    from backend.db.repositories.campaign_repo import get_campaign
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "brand_id": "brand-a"}])
+    assert get_campaign(CAMPAIGN_UUID, brand_id="brand-a") is not None
+    assert get_campaign(CAMPAIGN_UUID, brand_id="brand-b") is None
+
+
+def test_cached_rows_are_not_shared_with_callers(mock_sb):
+    """Editing a returned campaign's nested brief doesn't change the cache."""
+    from backend.db.repositories.campaign_repo import get_campaign
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "brief": {"budget_gbp": 100}}])
+    first = get_campaign(CAMPAIGN_UUID)
+    first["brief"]["budget_gbp"] = 0
+
+    second = get_campaign(CAMPAIGN_UUID)
+    assert second["brief"]["budget_gbp"] == 100
+    second["brief"]["budget_gbp"] = 1
+    assert get_campaign(CAMPAIGN_UUID)["brief"]["budget_gbp"] == 100
+
+
+def test_campaign_writes_drop_the_brand_dashboard(mock_sb):
+    """Status changes and saved results evict the brand's cached dashboard."""
+    from backend.cache import dashboard_cache
+    from backend.db.repositories.campaign_repo import save_campaign_result, update_campaign
+
+    mock_sb.seed_table("campaigns", [{"id": CAMPAIGN_UUID, "brand_id": "brand-a"}])
+    dashboard_cache.set("brand-a", {"stale": True})
+    dashboard_cache.set("brand-b", {"other": True})
+    assert update_campaign(CAMPAIGN_UUID, {"status": "running"}) is True
+    assert dashboard_cache.get("brand-a") is None
+    assert dashboard_cache.get("brand-b") is not None
+
+    dashboard_cache.set("brand-a", {"stale": True})
+    assert save_campaign_result(CAMPAIGN_UUID, {}) is True
+    assert dashboard_cache.get("brand-a") is None
+    dashboard_cache.clear()
+
+
+def test_invalidate_without_brand_clears_every_dashboard(mock_sb):
+    """Writers that only know the campaign id can't leave a dashboard stale."""
+    from backend.cache import dashboard_cache
+    from backend.db.repositories.campaign_repo import invalidate
+
+    dashboard_cache.set("brand-a", {"stale": True})
+    invalidate(CAMPAIGN_UUID)
+    assert dashboard_cache.get("brand-a") is None
@@ -1,7 +1,7 @@
 """Tests for compliance verification logic in campaign_monitor.py."""
 
 import pytest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 from tools.campaign_monitor import (
     _check_compliance,
@@ -97,12 +97,8 @@ class TestExtractRequired:
     """Test hashtag/mention extraction from brief."""
 
     def _make_context(self, brand_name="TestBrand", key_message=""):
-        ctx = MagicMock()
-        ctx.brief = MagicMock()
-        ctx.brief.brand_name = brand_name
-        ctx.brief.key_message = key_message
-        ctx.brief.deliverables = []
-        return ctx
+        brief = SimpleNamespace(brand_name=brand_name, key_message=key_message, deliverables=[])
+        return SimpleNamespace(brief=brief)
 
     def test_extract_hashtags_includes_disclosure(self):
         ctx = self._make_context("Acme")
@@ -128,8 +124,7 @@ class TestExtractRequired:
         assert "@testbrand" in mentions
 
     def test_extract_no_brief(self):
-        ctx = MagicMock()
-        ctx.brief = None
+        ctx = SimpleNamespace(brief=None)
         assert _extract_required_hashtags(ctx) == []
         assert _extract_required_mentions(ctx) == []
 
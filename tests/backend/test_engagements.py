@@ -4,12 +4,15 @@ All these routes live in backend.api.routes.campaigns with inline imports
 from engagement_repo, so we patch at the repo module level.
 """
 
+from collections import ChainMap
+from types import MappingProxyType
 from unittest.mock import patch
 
 R = "backend.api.routes.campaigns"
 REPO = "backend.db.repositories.engagement_repo"
 
-MOCK_ENGAGEMENT = {
+# Read-only so no test can leak edits into another; derive variants with ChainMap.
+MOCK_ENGAGEMENT = MappingProxyType({
     "id": "e1",
     "campaign_id": "c1",
     "creator_id": "creator-1",
@@ -25,14 +28,14 @@ MOCK_ENGAGEMENT = {
     ],
     "created_at": "2025-01-01T00:00:00Z",
     "updated_at": "2025-01-02T00:00:00Z",
-}
+})
 
 
 def test_list_engagements(client, auth_brand):
     """GET /api/campaigns/{id}/engagements returns creator engagements."""
     cmp = {"id": "c1", "brand_id": auth_brand["id"]}
     with patch(f"{R}.repo_get", return_value=cmp), \
-         patch(f"{REPO}.get_engagements", return_value=[MOCK_ENGAGEMENT]):
+         patch(f"{REPO}.get_engagements", return_value=[dict(MOCK_ENGAGEMENT)]):
         res = client.get("/api/campaigns/c1/engagements")
     assert res.status_code == 200
     assert len(res.json()) == 1
@@ -94,7 +97,7 @@ def test_update_engagement_invalid_status(client, auth_brand):
 def test_accept_terms(client, auth_brand):
     """POST /api/campaigns/{id}/accept-terms sets agreed status."""
     cmp = {"id": "c1", "brand_id": auth_brand["id"], "name": "Test"}
-    eng = {**MOCK_ENGAGEMENT, "status": "negotiating", "latest_proposal": {"fee_gbp": 500}}
+    eng = ChainMap({"status": "negotiating", "latest_proposal": {"fee_gbp": 500}}, MOCK_ENGAGEMENT)
     with patch(f"{R}.repo_get", return_value=cmp), \
          patch(f"{REPO}.get_engagement", return_value=eng), \
          patch(f"{REPO}.update_status", return_value=True), \
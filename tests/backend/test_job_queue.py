@@ -1,17 +1,41 @@
 """Job queue repository tests — verify the durable queue logic."""
 
+import pytest
 from unittest.mock import patch
 
+# One representative row covers every repo function under test; the mock
+# query ignores filters, so per-test seeding only repeated this.
+_JOB_ROW = {"id": "job-1", "campaign_id": "c1", "status": "queued", "attempts": 1, "max_attempts": 3}
 
-def test_enqueue_creates_job(mock_sb):
+
+@pytest.fixture()
+def jobs_sb(mock_sb):
+    """mock_sb with campaign_jobs pre-seeded (the mock never edits seeded rows in place)."""
+    mock_sb.seed_table("campaign_jobs", [_JOB_ROW])
+    return mock_sb
+
+
+def test_enqueue_creates_job(jobs_sb):
     """enqueue() inserts a row into campaign_jobs."""
     from backend.db.repositories.job_repo import enqueue
 
-    mock_sb.seed_table("campaign_jobs", [{"id": "job-1", "campaign_id": "c1", "status": "queued"}])
     job_id = enqueue("c1")
     assert job_id is not None
 
 
+def test_enqueue_batch_upserts_all_rows_at_once(jobs_sb):
+    """enqueue_batch() queues every campaign in a single upsert."""
+    from backend.db.repositories.job_repo import enqueue_batch
+
+    table = jobs_sb.table("campaign_jobs")
+    with patch("backend.db.repositories.job_repo.get_supabase", return_value=jobs_sb), \
+         patch.object(table, "upsert", wraps=table.upsert) as upsert:
+        jobs = enqueue_batch(["c1", "c2", "c3", "c1"])
+    assert upsert.call_count == 1
+    assert [r["campaign_id"] for r in upsert.call_args.args[0]] == ["c1", "c2", "c3"]
+    assert set(jobs) == {"c1", "c2", "c3"}
+
+
 def test_enqueue_returns_none_without_db():
     """enqueue() returns None when Supabase is unavailable."""
     from backend.db.repositories.job_repo import enqueue
@@ -30,33 +54,26 @@ def test_claim_next_returns_none_without_db():
     assert result is None
 
 
-def test_complete_marks_job_done(mock_sb):
+def test_complete_marks_job_done(jobs_sb):
     """complete() updates job status to completed."""
     from backend.db.repositories.job_repo import complete
 
-    mock_sb.seed_table("campaign_jobs", [{"id": "job-1", "status": "running"}])
     result = complete("job-1")
     assert result is True
 
 
-def test_fail_requeues_under_max_attempts(mock_sb):
+def test_fail_requeues_under_max_attempts(jobs_sb):
     """fail() re-queues if attempts < max_attempts."""
     from backend.db.repositories.job_repo import fail
 
-    mock_sb.seed_table("campaign_jobs", [
-        {"id": "job-1", "status": "running", "attempts": 1, "max_attempts": 3}
-    ])
     result = fail("job-1", "some error")
     assert result is True
 
 
-def test_get_job_for_campaign(mock_sb):
+def test_get_job_for_campaign(jobs_sb):
     """get_job_for_campaign() returns the job row."""
     from backend.db.repositories.job_repo import get_job_for_campaign
 
-    mock_sb.seed_table("campaign_jobs", [
-        {"id": "job-1", "campaign_id": "c1", "status": "queued"}
-    ])
     job = get_job_for_campaign("c1")
     assert job is not None
     assert job["campaign_id"] == "c1"
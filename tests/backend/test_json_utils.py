@@ -0,0 +1,28 @@
+"""Tests for the shared JSON helpers in services/json_utils.py."""
+
+import json
+from datetime import datetime, timezone
+from enum import Enum
+
+from services.json_utils import dumps, write_json_atomic
+
+
+class _Color(Enum):
+    RED = "red"
+
+
+def test_dumps_compact_and_tolerant():
+    """Compact by default; int keys, datetimes and other objects still encode."""
+    ts = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    out = dumps({1: ts, "c": _Color.RED})
+    assert out == '{"1":"2025-01-02T03:04:05+00:00","c":"_Color.RED"}'
+    assert dumps({"a": [1]}, indent=2) == '{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    """The target is replaced whole and no temp file is left behind."""
+    path = tmp_path / "out.json"
+    path.write_text("stale")
+    write_json_atomic(path, {"ok": True})
+    assert json.loads(path.read_text()) == {"ok": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
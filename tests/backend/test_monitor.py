@@ -1,22 +1,24 @@
 """Tests for campaign monitoring endpoints and compliance verification."""
 
-import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-R = "backend.api.routes.campaigns"
+from postgrest.exceptions import APIError
+
+from backend.db.repositories.monitor_repo import get_monitor_summary_batch
+
+
+_BASE_CAMPAIGN = {
+    "id": "cmp-1", "brand_id": "brand-uuid-1234", "name": "Test",
+    "status": "completed", "result_json": {}, "completed_at": None,
+}
 
 
 def _campaign(**overrides):
-    """Helper to create a campaign dict."""
-    base = {
-        "id": "cmp-1", "brand_id": "brand-uuid-1234", "name": "Test",
-        "status": "completed", "result_json": {}, "completed_at": None,
-    }
-    base.update(overrides)
-    return base
+    """Helper to create a campaign dict (nested values are shared, read-only)."""
+    return {**_BASE_CAMPAIGN, **overrides}
 
 
-def test_monitor_endpoint_returns_snapshot(client):
+def test_monitor_endpoint_returns_snapshot(client, patch_route):
     """GET /api/campaigns/{id}/monitor returns latest snapshot."""
     snapshot = {
         "id": "snap-1",
@@ -26,48 +28,48 @@ def test_monitor_endpoint_returns_snapshot(client):
         "created_at": "2025-01-01T00:00:00Z",
     }
 
-    with patch(f"{R}.repo_get", return_value=_campaign()), \
-         patch("backend.db.repositories.monitor_repo.get_latest_snapshot", return_value=snapshot):
-        res = client.get("/api/campaigns/cmp-1/monitor")
-        assert res.status_code == 200
-        data = res.json()
-        assert data["snapshot_id"] == "snap-1"
-        assert len(data["updates"]) == 1
-        assert data["summary"]["posts_live"] == 1
+    patch_route("campaigns", "repo_get", lambda *a, **kw: _campaign())
+    patch_route("monitor_repo", "get_latest_snapshot", lambda *a, **kw: snapshot)
+    res = client.get("/api/campaigns/cmp-1/monitor")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["snapshot_id"] == "snap-1"
+    assert len(data["updates"]) == 1
+    assert data["summary"]["posts_live"] == 1
 
 
-def test_monitor_endpoint_no_snapshot(client):
+def test_monitor_endpoint_no_snapshot(client, patch_route):
     """GET /api/campaigns/{id}/monitor returns empty when no snapshots."""
-    with patch(f"{R}.repo_get", return_value=_campaign(result_json=None)), \
-         patch("backend.db.repositories.monitor_repo.get_latest_snapshot", return_value=None):
-        res = client.get("/api/campaigns/cmp-1/monitor")
-        assert res.status_code == 200
-        data = res.json()
-        assert data["updates"] == []
-        assert data["snapshot_id"] is None
+    patch_route("campaigns", "repo_get", lambda *a, **kw: _campaign(result_json=None))
+    patch_route("monitor_repo", "get_latest_snapshot", lambda *a, **kw: None)
+    res = client.get("/api/campaigns/cmp-1/monitor")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["updates"] == []
+    assert data["snapshot_id"] is None
 
 
-def test_monitor_404(client):
+def test_monitor_404(client, patch_route):
     """GET /api/campaigns/{id}/monitor returns 404 for missing campaign."""
-    with patch(f"{R}.repo_get", return_value=None):
-        res = client.get("/api/campaigns/missing/monitor")
-        assert res.status_code == 404
+    patch_route("campaigns", "repo_get", lambda *a, **kw: None)
+    res = client.get("/api/campaigns/missing/monitor")
+    assert res.status_code == 404
 
 
-def test_insights_endpoint(client):
+def test_insights_endpoint(client, patch_route):
     """GET /api/campaigns/{id}/insights returns insights data."""
     summary = {"posts_analyzed": 5, "purchase_intent": {"avg_score": 72.3}}
 
-    with patch(f"{R}.repo_get", return_value=_campaign()), \
-         patch("backend.db.repositories.insights_repo.get_insights_summary", return_value=summary), \
-         patch("backend.db.repositories.insights_repo.get_insights", return_value=[]):
-        res = client.get("/api/campaigns/cmp-1/insights")
-        assert res.status_code == 200
-        data = res.json()
-        assert data["summary"]["posts_analyzed"] == 5
+    patch_route("campaigns", "repo_get", lambda *a, **kw: _campaign())
+    patch_route("insights_repo", "get_insights_summary", lambda *a, **kw: summary)
+    patch_route("insights_repo", "get_insights", lambda *a, **kw: [])
+    res = client.get("/api/campaigns/cmp-1/insights")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["summary"]["posts_analyzed"] == 5
 
 
-def test_report_endpoint(client):
+def test_report_endpoint(client, patch_route):
     """GET /api/campaigns/{id}/report returns enriched report."""
     cmp = _campaign(
         status="completed",
@@ -75,26 +77,66 @@ def test_report_endpoint(client):
         completed_at="2025-01-01T00:00:00Z",
     )
 
-    with patch(f"{R}.repo_get", return_value=cmp), \
-         patch("backend.db.repositories.monitor_repo.get_monitor_summary", return_value={"posts_live": 3}), \
-         patch("backend.db.repositories.insights_repo.get_insights_summary", return_value={"posts_analyzed": 2}):
-        res = client.get("/api/campaigns/cmp-1/report")
-        assert res.status_code == 200
-        data = res.json()
-        assert data["monitor_summary"]["posts_live"] == 3
-        assert data["insights_summary"]["posts_analyzed"] == 2
-        assert data["status"] == "completed"
+    patch_route("campaigns", "repo_get", lambda *a, **kw: cmp)
+    patch_route("monitor_repo", "get_monitor_summary", lambda *a, **kw: {"posts_live": 3})
+    patch_route("insights_repo", "get_insights_summary", lambda *a, **kw: {"posts_analyzed": 2})
+    res = client.get("/api/campaigns/cmp-1/report")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["monitor_summary"]["posts_live"] == 3
+    assert data["insights_summary"]["posts_analyzed"] == 2
+    assert data["status"] == "completed"
 
 
-def test_insights_endpoint_404(client):
+def test_insights_endpoint_404(client, patch_route):
     """GET /api/campaigns/{id}/insights returns 404 for missing campaign."""
-    with patch(f"{R}.repo_get", return_value=None):
-        res = client.get("/api/campaigns/missing/insights")
-        assert res.status_code == 404
+    patch_route("campaigns", "repo_get", lambda *a, **kw: None)
+    res = client.get("/api/campaigns/missing/insights")
+    assert res.status_code == 404
 
 
-def test_report_endpoint_404(client):
+def test_report_endpoint_404(client, patch_route):
     """GET /api/campaigns/{id}/report returns 404 for missing campaign."""
-    with patch(f"{R}.repo_get", return_value=None):
-        res = client.get("/api/campaigns/missing/report")
-        assert res.status_code == 404
+    patch_route("campaigns", "repo_get", lambda *a, **kw: None)
+    res = client.get("/api/campaigns/missing/report")
+    assert res.status_code == 404
+
+
+MON_REPO = "backend.db.repositories.monitor_repo"
+
+
+def test_monitor_summary_batch_uses_latest_rpc(mock_sb):
+    """get_monitor_summary_batch maps latest_monitor_summaries rows by campaign."""
+
+    mock_sb._rpc_results["latest_monitor_summaries"] = [
+        {"campaign_id": "cmp-1", "summary": {"posts_live": 2}},
+    ]
+    with patch(f"{MON_REPO}.get_supabase", return_value=mock_sb):
+        assert get_monitor_summary_batch(["cmp-1", "cmp-2"]) == {"cmp-1": {"posts_live": 2}}
+
+
+def test_monitor_summary_batch_falls_back_without_rpc(mock_sb, monkeypatch):
+    """Before migration 017 the newest snapshot per campaign comes from a scan."""
+
+    def _missing(*a, **kw):
+        raise APIError({"code": "PGRST202", "message": "function not found"})
+
+    monkeypatch.setattr(mock_sb, "rpc", _missing)
+    mock_sb.seed_table("campaign_monitor_updates", [
+        {"id": "s2", "campaign_id": "cmp-1", "summary": {"posts_live": 2}},
+        {"id": "s1", "campaign_id": "cmp-1", "summary": {"posts_live": 1}},
+    ])
+    with patch(f"{MON_REPO}.get_supabase", return_value=mock_sb):
+        assert get_monitor_summary_batch(["cmp-1"]) == {"cmp-1": {"posts_live": 2}}
+
+
+def test_monitor_summary_batch_no_scan_on_other_errors(mock_sb, monkeypatch):
+    """Other RPC failures don't fall back to scanning every snapshot."""
+
+    def _timeout(*a, **kw):
+        raise APIError({"code": "57014", "message": "statement timeout"})
+
+    monkeypatch.setattr(mock_sb, "rpc", _timeout)
+    mock_sb.seed_table("campaign_monitor_updates", [{"id": "s1", "campaign_id": "cmp-1", "summary": {}}])
+    with patch(f"{MON_REPO}.get_supabase", return_value=mock_sb):
+        assert get_monitor_summary_batch(["cmp-1"]) == {}
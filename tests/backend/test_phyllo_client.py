@@ -0,0 +1,108 @@
+"""Tests for response caching, conditional polls and poll sharing in phyllo_client.py."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from backend.cache import insightiq_get_cache, insightiq_job_cache
+from services import phyllo_client
+from services.phyllo_client import PhylloClient
+
+
+def _response(body, status=200, etag=None):
+    r = MagicMock(status_code=status, headers={"ETag": etag} if etag else {})
+    r.json.return_value = body
+    if status >= 400:
+        r.raise_for_status.side_effect = requests.HTTPError(response=r)
+    return r
+
+
+@pytest.fixture()
+def iq():
+    """A configured client whose session is a mock; shared caches start empty."""
+    insightiq_get_cache.clear()
+    insightiq_job_cache.clear()
+    c = PhylloClient(client_id="id", client_secret="secret", base_url="https://iq.test/v1")
+    c._session = MagicMock(spec=requests.Session)
+    yield c
+    insightiq_get_cache.clear()
+    insightiq_job_cache.clear()
+
+
+def test_get_served_from_cache(iq):
+    """A repeat GET with the same params doesn't hit the API."""
+    iq._session.get.return_value = _response({"data": [1]})
+    assert iq._get("/profiles", {"q": "a"}) == {"data": [1]}
+    assert iq._get("/profiles", {"q": "a"}) == {"data": [1]}
+    assert iq._session.get.call_count == 1
+
+    iq._get("/profiles", {"q": "b"})
+    assert iq._session.get.call_count == 2
+
+
+def test_no_cache_bypasses_cache(iq):
+    """no_cache always fetches and never fills the shared cache."""
+    iq._session.get.return_value = _response({"status": "PENDING"})
+    iq._get("/jobs/1", no_cache=True)
+    iq._get("/jobs/1", no_cache=True)
+    assert iq._session.get.call_count == 2
+
+    iq._session.get.return_value = _response({"status": "DONE"})
+    assert iq._get("/jobs/1") == {"status": "DONE"}
+    assert iq._session.get.call_count == 3
+
+
+def test_not_modified_returns_cached_body(iq):
+    """A 304 on a conditional poll returns the body stored with the ETag."""
+    iq._session.get.side_effect = [
+        _response({"status": "PENDING"}, etag='"v1"'),
+        _response(None, status=304),
+    ]
+    assert iq._get("/jobs/1", no_cache=True) == {"status": "PENDING"}
+    assert iq._get("/jobs/1", no_cache=True) == {"status": "PENDING"}
+    assert iq._session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_etags_capped(iq):
+    """The per-client ETag map drops its oldest entry past the cap."""
+    iq._session.get.side_effect = lambda url, **kw: _response({}, etag=url)
+    for i in range(phyllo_client._ETAG_MAX_ENTRIES + 1):
+        iq._get(f"/jobs/{i}", no_cache=True)
+    assert len(iq._etags) == phyllo_client._ETAG_MAX_ENTRIES
+    assert "/jobs/0" not in iq._etags
+    assert f"/jobs/{phyllo_client._ETAG_MAX_ENTRIES}" in iq._etags
+
+
+def test_concurrent_polls_share_one_request(iq, monkeypatch):
+    """Two callers polling the same job wait on one HTTP request."""
+    # Without the finished-job cache a late follower would fetch again.
+    monkeypatch.setattr(phyllo_client, "insightiq_job_cache", None)
+    started, release = threading.Event(), threading.Event()
+
+    def _slow_get(url, **kw):
+        started.set()
+        release.wait(5)
+        return _response({"status": "COMPLETED", "score": 1})
+
+    iq._session.get.side_effect = _slow_get
+    results = []
+
+    def _poll():
+        results.append(iq._poll_job("job-1", "/insights/purchase-intent", max_wait=5))
+
+    leader = threading.Thread(target=_poll)
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=_poll)
+    follower.start()
+    time.sleep(0.1)  # let the follower find the in-flight poll
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert iq._session.get.call_count == 1
+    assert results == [{"status": "COMPLETED", "score": 1}] * 2
+    assert PhylloClient._inflight == {}
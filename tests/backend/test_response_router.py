@@ -0,0 +1,113 @@
+"""Tests for reply routing and the .tmp SQLite engagement store."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from services import response_router as rr
+
+
+@pytest.fixture()
+def tmp_dir(tmp_path, mock_sb):
+    """A fresh .tmp dir; mock_sb keeps ingest's Supabase writes offline."""
+    return tmp_path
+
+
+def _write_sent(tmp_dir, campaign_id, messages, mtime=None):
+    path = tmp_dir / f"outreach_sent_{campaign_id}.json"
+    path.write_text(json.dumps({"messages": messages}))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_ingest_round_trip(tmp_dir):
+    """Replies routed by email append to one engagement row."""
+    rr.record_outreach(tmp_dir, "cmp-1", [{"email": "Alice@Test.com", "creator_id": "cr-1", "message_id": "m1"}])
+
+    first = rr.ingest_response("Interested!", from_email="alice@test.com", tmp_dir=tmp_dir)
+    second = rr.ingest_response("What's the fee?", from_email="alice@test.com", tmp_dir=tmp_dir)
+
+    assert first["success"] and second["success"]
+    assert (second["campaign_id"], second["creator_id"]) == ("cmp-1", "cr-1")
+    stored = rr._load_engagements(tmp_dir, "cmp-1")
+    assert list(stored) == ["cr-1"]
+    assert [m["body"] for m in stored["cr-1"]["message_history"]] == ["Interested!", "What's the fee?"]
+    assert stored["cr-1"]["status"] == "responded"
+
+
+def test_ingest_unknown_sender(tmp_dir):
+    """A reply that can't be routed is reported, not stored."""
+    res = rr.ingest_response("hi", from_email="nobody@test.com", tmp_dir=tmp_dir)
+    assert res["success"] is False
+
+
+def test_legacy_engagements_imported_once(tmp_dir):
+    """A pre-SQLite campaign_engagements JSON file is imported on first read only."""
+    legacy = rr._legacy_engagements_path(tmp_dir, "cmp-1")
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps({"cr-1": {"creator_id": "cr-1", "status": "contacted", "message_history": []}}))
+
+    assert rr._load_engagements(tmp_dir, "cmp-1")["cr-1"]["status"] == "contacted"
+
+    # Later edits to the JSON file are ignored once the rows exist.
+    legacy.write_text(json.dumps({"cr-2": {"creator_id": "cr-2", "status": "declined"}}))
+    assert list(rr._load_engagements(tmp_dir, "cmp-1")) == ["cr-1"]
+    assert rr._load_engagement(tmp_dir, "cmp-1", "cr-2") == {}
+
+
+def test_lookup_by_email_hit(tmp_dir):
+    """The most recent send to an address wins."""
+    rr.record_outreach(tmp_dir, "cmp-old", [{"email": "a@test.com", "creator_id": "1"}], sent_ns=1)
+    rr.record_outreach(tmp_dir, "cmp-new", [{"email": "a@test.com", "creator_id": "2"}], sent_ns=2)
+    assert rr._lookup_by_email(tmp_dir, " A@test.com ") == ("cmp-new", "2")
+
+
+def test_lookup_by_email_miss_backfills_legacy_files(tmp_dir):
+    """A miss indexes outreach_sent files once, without outranking newer sends."""
+    rr.record_outreach(tmp_dir, "cmp-new", [{"email": "b@test.com", "creator_id": "2", "message_id": "m2"}])
+    _write_sent(tmp_dir, "cmp-old", [
+        {"email": "a@test.com", "creator_id": "1", "message_id": "m1"},
+        {"email": "b@test.com", "creator_id": "9", "message_id": "m9"},
+    ], mtime=1_000_000)
+
+    assert rr._lookup_by_email(tmp_dir, "a@test.com") == ("cmp-old", "1")
+    assert rr._lookup_by_email(tmp_dir, "b@test.com") == ("cmp-new", "2")
+    # Indexed files aren't read again on the next miss.
+    assert rr._backfill_outreach_index(tmp_dir) is False
+    assert rr._lookup_by_email(tmp_dir, "nobody@test.com") is None
+
+
+def test_record_outreach_dedupes(tmp_dir):
+    """The same send indexed twice is stored once."""
+    msg = [{"email": "a@test.com", "creator_id": "1", "message_id": "m1"}]
+    rr.record_outreach(tmp_dir, "cmp-1", msg)
+    rr.record_outreach(tmp_dir, "cmp-1", msg)
+    assert rr._db(tmp_dir).execute("SELECT COUNT(*) FROM outreach").fetchone()[0] == 1
+
+
+def test_outreach_migration_v1_on_existing_db(tmp_dir):
+    """A pre-V1 database is deduped and its rows dated from the outreach files."""
+    conn = sqlite3.connect(tmp_dir / rr._ENGAGEMENTS_DB)
+    conn.execute(
+        "CREATE TABLE outreach (email TEXT NOT NULL, campaign_id TEXT NOT NULL,"
+        " creator_id TEXT NOT NULL, message_id TEXT)"
+    )
+    conn.executemany("INSERT INTO outreach VALUES (?, ?, ?, ?)", [
+        ("a@test.com", "cmp-1", "1", "m1"),
+        ("a@test.com", "cmp-1", "1", "m1"),
+        ("b@test.com", "cmp-1", "2", None),
+        ("b@test.com", "cmp-1", "2", None),
+    ])
+    conn.commit()
+    conn.close()
+    _write_sent(tmp_dir, "cmp-1", [], mtime=2_000_000)
+
+    db = rr._db(tmp_dir)
+
+    assert db.execute("PRAGMA user_version").fetchone()[0] == 1
+    rows = db.execute("SELECT email, sent_ns FROM outreach ORDER BY rowid").fetchall()
+    assert rows == [("a@test.com", 2_000_000 * 10**9), ("b@test.com", 2_000_000 * 10**9)]
+    assert rr._lookup_by_email(tmp_dir, "a@test.com") == ("cmp-1", "1")
@@ -1,5 +1,6 @@
 """Shared pytest fixtures — mock Supabase and auth for all backend tests."""
 
+import importlib
 import os
 import pytest
 from unittest.mock import MagicMock, patch
@@ -7,16 +8,28 @@ from unittest.mock import MagicMock, patch
 
 # ── Ensure env vars don't hit real services ──────────────────
 
-@pytest.fixture(autouse=True)
-def _isolate_env(monkeypatch):
-    """Prevent tests from connecting to real Supabase / APIs."""
-    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
-    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "test-service-key")
-    monkeypatch.setenv("SUPABASE_JWT_SECRET", "test-jwt-secret")
-    monkeypatch.setenv("ANTHROPIC_API_KEY", "")
-    monkeypatch.setenv("RESEND_API_KEY", "")
-    monkeypatch.setenv("INSIGHTIQ_CLIENT_ID", "")
-    monkeypatch.setenv("INSIGHTIQ_CLIENT_SECRET", "")
+_TEST_ENV = {
+    "SUPABASE_URL": "https://test.supabase.co",
+    "SUPABASE_SERVICE_KEY": "test-service-key",
+    "SUPABASE_JWT_SECRET": "test-jwt-secret",
+    "ANTHROPIC_API_KEY": "",
+    "RESEND_API_KEY": "",
+    "INSIGHTIQ_CLIENT_ID": "",
+    "INSIGHTIQ_CLIENT_SECRET": "",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolate_env():
+    """Prevent tests from connecting to real Supabase / APIs.
+
+    Set once for the session; tests that change these use their own
+    monkeypatch, which restores the session values afterwards.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in _TEST_ENV.items():
+            mp.setenv(key, value)
+        yield
 
 
 # ── Mock Supabase client ─────────────────────────────────────
@@ -28,55 +41,55 @@ class MockSupabaseResponse:
         self.data = data or []
 
 
+def _chain(self, *a, **kw):
+    return self
+
+
 class MockSupabaseQuery:
-    """Chainable mock for sb.table(...).select(...).eq(...).execute()."""
+    """Chainable mock for sb.table(...).select(...).eq(...).execute().
 
-    def __init__(self, data=None):
-        self._data = data or []
+    Rows are held as a tuple and replaced (never edited in place) on
+    writes, so seeded fixtures can be shared between tests. Filters don't
+    filter — tests seed only the rows that should match.
+    """
 
-    def select(self, *a, **kw):
-        return self
+    def __init__(self, data=()):
+        self._data = tuple(data or ())
+
+    select = eq = neq = in_ = order = limit = _chain
+
+    def __getattr__(self, name):
+        # Any other public query builder method (gte, ilike, ...) chains too.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.select
 
     def insert(self, row, **kw):
         # Auto-assign an id if missing
         if isinstance(row, dict) and "id" not in row:
             row["id"] = "mock-uuid-1234"
-        self._data = [row]
+        self._data = (row,)
         return self
 
     def update(self, updates, **kw):
         if self._data:
-            self._data[0].update(updates)
+            self._data = ({**self._data[0], **updates},) + self._data[1:]
         return self
 
     def upsert(self, row, **kw):
-        if isinstance(row, dict) and "id" not in row:
-            row["id"] = "mock-uuid-1234"
-        self._data = [row]
+        rows = row if isinstance(row, list) else [row]
+        for i, r in enumerate(rows):
+            if isinstance(r, dict) and "id" not in r:
+                r["id"] = "mock-uuid-1234" if len(rows) == 1 else f"mock-uuid-{i}"
+        self._data = tuple(rows)
         return self
 
     def delete(self):
-        self._data = []
-        return self
-
-    def eq(self, *a, **kw):
-        return self
-
-    def neq(self, *a, **kw):
-        return self
-
-    def in_(self, *a, **kw):
-        # Tests seed only the rows that should match; no filtering needed.
-        return self
-
-    def order(self, *a, **kw):
-        return self
-
-    def limit(self, *a, **kw):
+        self._data = ()
         return self
 
     def execute(self):
-        return MockSupabaseResponse(self._data)
+        return MockSupabaseResponse(list(self._data))
 
 
 class MockSupabaseClient:
@@ -93,7 +106,7 @@ class MockSupabaseClient:
 
     def seed_table(self, name, rows):
         """Pre-load data for a table."""
-        self._tables[name] = MockSupabaseQuery(list(rows))
+        self._tables[name] = MockSupabaseQuery(rows)
 
     def rpc(self, fn_name, params=None):
         return MockSupabaseQuery(self._rpc_results.get(fn_name, []))
@@ -102,13 +115,18 @@ class MockSupabaseClient:
 @pytest.fixture()
 def mock_sb():
     """Provide a mock Supabase client and patch get_supabase()."""
+    # Import before patching so the repo binds the real get_supabase()
+    from backend.db.repositories import campaign_repo
+
     client = MockSupabaseClient()
     with patch("backend.db.client.get_supabase", return_value=client):
         # Also reset the module-level cache
         import backend.db.client as db_mod
         db_mod._SUPABASE_CLIENT = client
+        campaign_repo.invalidate()
         yield client
         db_mod._SUPABASE_CLIENT = None
+        campaign_repo.invalidate()
 
 
 # ── Mock auth ────────────────────────────────────────────────
@@ -132,16 +150,60 @@ def auth_brand():
 
 # ── FastAPI TestClient ───────────────────────────────────────
 
-@pytest.fixture()
-def client(mock_sb, auth_brand):
-    """FastAPI TestClient with auth bypassed and Supabase mocked."""
-    from fastapi.testclient import TestClient
+@pytest.fixture(scope="session")
+def _app():
+    """Import the FastAPI app once per session.
 
-    # Must import app AFTER mocking
+    Repos imported here bind the real get_supabase(), which returns the
+    client mock_sb installs in backend.db.client._SUPABASE_CLIENT.
+    """
     from backend.main import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def _test_client(_app):
+    """One TestClient for the session.
+
+    Deliberately not entered as a context manager: that runs the startup
+    hook, which launches the campaign worker thread.
+    """
+    from fastapi.testclient import TestClient
+    return TestClient(_app)
+
+
+@pytest.fixture()
+def client(mock_sb, auth_brand, _app, _test_client):
+    """FastAPI TestClient with auth bypassed and Supabase mocked."""
     from backend.auth.current_brand import get_current_brand
 
-    app.dependency_overrides[get_current_brand] = lambda: auth_brand
-    tc = TestClient(app)
-    yield tc
-    app.dependency_overrides.clear()
+    _app.dependency_overrides[get_current_brand] = lambda: auth_brand
+    yield _test_client
+    _app.dependency_overrides.clear()
+
+
+# ── Route / repo attribute patching ──────────────────────────
+
+_PATCH_MODULES = {
+    "campaigns": "backend.api.routes.campaigns",
+    "notifications": "backend.api.routes.notifications",
+    "campaign_repo": "backend.db.repositories.campaign_repo",
+    "insights_repo": "backend.db.repositories.insights_repo",
+    "monitor_repo": "backend.db.repositories.monitor_repo",
+    "template_repo": "backend.db.repositories.template_repo",
+}
+
+
+@pytest.fixture(scope="session")
+def _routes(_app):
+    """Route and repo modules tests patch, imported once (after the app)."""
+    return {key: importlib.import_module(name) for key, name in _PATCH_MODULES.items()}
+
+
+@pytest.fixture()
+def patch_route(monkeypatch, _routes):
+    """Set a module attribute for one test: patch_route("campaigns", "repo_get", fn)."""
+    def _p(module_key, attr, value):
+        monkeypatch.setattr(_routes[module_key], attr, value)
+        return value
+    return _p
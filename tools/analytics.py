@@ -3,24 +3,54 @@
 import json
 import logging
 import os
+import re
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-from anthropic import Anthropic
-from dotenv import load_dotenv
+_PKG_ROOT = Path(__file__).resolve().parent.parent
+if str(_PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PKG_ROOT))
 
 from models.actions import AgentAction, AgentActionType, ToolResult
 from models.context import CampaignContext
+from services.json_utils import dumps
 from tools.base import BaseTool
 
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
 logger = logging.getLogger(__name__)
 
-load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# anthropic and the .env file are only needed once a report is generated,
+# so they're loaded on first use rather than at import.
+_DOTENV_LOADED = False
+
+# Shared by every AnalyticsTool so reports reuse one connection pool.
+_ANTHROPIC_CLIENT: Optional["Anthropic"] = None
+# Whether ANTHROPIC_API_KEY is set; decided once, after .env is loaded.
+_LLM_ENABLED: Optional[bool] = None
+
 
-REPORT_PROMPT = """You are Hudey, an AI marketing analyst. Generate a campaign report with:
+def reset_llm_client() -> None:
+    """Forget the shared Anthropic client and the API-key check (e.g. after the key changes)."""
+    global _ANTHROPIC_CLIENT, _LLM_ENABLED
+    _ANTHROPIC_CLIENT = None
+    _LLM_ENABLED = None
+
+
+def _load_dotenv_once() -> None:
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv(_PKG_ROOT / ".env")
+        _DOTENV_LOADED = True
+
+# Split so the brief/strategy half can be marked for prompt caching: it is
+# the same on every report regeneration for a campaign, the metrics aren't.
+REPORT_PROMPT_CONTEXT = """You are Hudey, an AI marketing analyst. Generate a campaign report with:
 1. Executive summary (3 bullet points)
 2. What worked well (3 bullets)
 3. What could improve (3 bullets)
@@ -34,8 +64,9 @@ Campaign brief:
 
 Strategy summary:
 {strategy_json}
+"""
 
-Aggregated metrics:
+REPORT_PROMPT_DATA = """Aggregated metrics:
 {metrics_json}
 
 Campaign insights (purchase intent & comments relevance):
@@ -55,41 +86,80 @@ Return JSON:
 Return ONLY the JSON object."""
 
 
+def _strip_code_fence(text: str) -> str:
+    """Drop the opening ```lang line and, if present, the closing ``` line."""
+    first_nl = text.find("\n")
+    if first_nl == -1:
+        return ""
+    last_nl = text.rfind("\n")
+    if text[last_nl + 1:] == "```":
+        return text[first_nl + 1:last_nl] if last_nl > first_nl else ""
+    return text[first_nl + 1:]
+
+
 class AnalyticsTool(BaseTool):
     """Aggregate metrics and ask Claude for insights."""
 
     action_type = AgentActionType.GENERATE_REPORT.value
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, report_indent: Optional[int] = None):
         self.output_dir = output_dir or Path(".tmp")
+        # Reports are written compact; pass an indent to get a human-readable file.
+        self.report_indent = report_indent
         self._client = None
+        self._model_json_cache: dict = {}
 
     def can_handle(self, action_type: str) -> bool:
         return action_type == self.action_type
 
-    def _get_client(self) -> Optional[Anthropic]:
-        if self._client is None and os.getenv("ANTHROPIC_API_KEY"):
-            self._client = Anthropic()
+    def _get_client(self) -> Optional["Anthropic"]:
+        global _ANTHROPIC_CLIENT, _LLM_ENABLED
+        if self._client is None:
+            if _LLM_ENABLED is None:
+                _load_dotenv_once()
+                _LLM_ENABLED = bool(os.getenv("ANTHROPIC_API_KEY"))
+            if not _LLM_ENABLED:
+                return None
+            if _ANTHROPIC_CLIENT is None:
+                from anthropic import Anthropic
+                _ANTHROPIC_CLIENT = Anthropic()
+            self._client = _ANTHROPIC_CLIENT
         return self._client
 
+    def _model_json(self, model) -> str:
+        """Compact JSON for a brief/strategy, serialised once per model object."""
+        if model is None:
+            return "{}"
+        key = (id(model), type(model))
+        cached = self._model_json_cache.get(key)
+        # Holding the model in the entry keeps its id from being reused.
+        if cached is None or cached[0] is not model:
+            cached = (model, model.model_dump_json())
+            if len(self._model_json_cache) >= 8:
+                self._model_json_cache.clear()
+            self._model_json_cache[key] = cached
+        return cached[1]
+
     def _aggregate_metrics(self, context: CampaignContext) -> dict:
         updates = context.monitor_updates or []
-        total_posts = sum(1 for u in updates if u.get("posted"))
-        totals = {"likes": 0, "comments": 0, "shares": 0, "saves": 0}
+        total_posts = likes = comments = shares = saves = 0
         for u in updates:
             if not u.get("posted"):
                 continue
+            total_posts += 1
             metrics = u.get("metrics", {})
-            for key in totals:
-                totals[key] += metrics.get(key, 0)
+            likes += metrics.get("likes", 0)
+            comments += metrics.get("comments", 0)
+            shares += metrics.get("shares", 0)
+            saves += metrics.get("saves", 0)
 
         return {
             "creators_total": len(context.creators),
             "posts_live": total_posts,
-            "likes": totals["likes"],
-            "comments": totals["comments"],
-            "shares": totals["shares"],
-            "saves": totals["saves"],
+            "likes": likes,
+            "comments": comments,
+            "shares": shares,
+            "saves": saves,
         }
 
     def _generate_insights(self, context: CampaignContext, metrics: dict) -> dict:
@@ -117,36 +187,44 @@ class AnalyticsTool(BaseTool):
             )
         if not insights_data:
             insights_path = self.output_dir / f"campaign_insights_{context.campaign_id}.json"
-            if insights_path.exists():
-                try:
-                    insights_data = json.loads(insights_path.read_text()).get("summary", {})
-                except (OSError, json.JSONDecodeError) as e:
-                    logger.warning(
-                        "analytics: failed to read insights file %s: %s",
-                        insights_path, e,
-                    )
+            try:
+                with open(insights_path, "rb") as f:
+                    insights_data = json.loads(f.read()).get("summary", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(
+                    "analytics: failed to read insights file %s: %s",
+                    insights_path, e,
+                )
 
-        prompt = REPORT_PROMPT.format(
-            brief_json=context.brief.model_dump_json(indent=2) if context.brief else "{}",
-            strategy_json=context.strategy.model_dump_json(indent=2) if context.strategy else "{}",
-            metrics_json=json.dumps(metrics, indent=2),
-            insights_json=json.dumps(insights_data, indent=2) if insights_data else "No insights data available",
+        context_prompt = REPORT_PROMPT_CONTEXT.format(
+            brief_json=self._model_json(context.brief),
+            strategy_json=self._model_json(context.strategy),
+        )
+        data_prompt = REPORT_PROMPT_DATA.format(
+            metrics_json=dumps(metrics),
+            insights_json=dumps(insights_data) if insights_data else "No insights data available",
         )
         message = client.messages.create(
             model="claude-sonnet-4-5",
             max_tokens=800,
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": context_prompt, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": data_prompt},
+                ],
+            }],
         )
         text = message.content[0].text.strip()
         if text.startswith("```"):
-            lines = text.split("\n")
-            text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+            text = _strip_code_fence(text)
         try:
             return json.loads(text)
         except json.JSONDecodeError as first_err:
             # LLM sometimes wraps JSON in prose — try to extract the first object.
-            import re
-            match = re.search(r"\{.*\}", text, re.DOTALL)
+            match = _JSON_OBJECT_RE.search(text)
             if match:
                 try:
                     return json.loads(match.group())
@@ -211,7 +289,7 @@ class AnalyticsTool(BaseTool):
             "campaign_insights": campaign_insights,
         }
         path = self.output_dir / f"campaign_report_{context.campaign_id}.json"
-        path.write_text(json.dumps(report, indent=2))
+        path.write_text(dumps(report, self.report_indent))
 
         return ToolResult(
             success=True,
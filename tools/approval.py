@@ -1,8 +1,14 @@
 """Approval tool - request and check human approval."""
 
+import hashlib
 import json
 import logging
+import os
+import random
+import select
 import sys
+import time
+from enum import Enum
 from pathlib import Path
 
 # Add project root to path
@@ -12,9 +18,51 @@ from typing import Optional
 
 from models.actions import AgentAction, AgentActionType, ToolResult
 from models.context import CampaignContext
+from services.json_utils import write_json_atomic
+
+try:
+    from backend.db.client import reset_supabase
+    from backend.db.repositories.approval_repo import (
+        create_approval_and_mark_waiting,
+        decide_approval,
+        decision_event,
+        discard_decision_event,
+        get_approval,
+    )
+    from backend.db.repositories.campaign_repo import update_campaign
+except ImportError:  # CLI-only installs: ApprovalTool works without the backend
+    reset_supabase = create_approval_and_mark_waiting = decide_approval = None
+    decision_event = discard_decision_event = None
+    get_approval = update_campaign = None
 
 logger = logging.getLogger(__name__)
 
+# How long to wait between approval reads when no in-process decision
+# arrives. Decisions made through the API wake the waiter immediately.
+FALLBACK_POLL_SECONDS = 15
+
+# A web approval nobody answers gives up after this long instead of holding
+# the campaign worker forever.
+DEFAULT_APPROVAL_MAX_WAIT_SECONDS = 24 * 3600
+
+# Read errors back off exponentially (1s doubling to a 16s cap, plus up
+# to 0.5s jitter). The client is only rebuilt every few consecutive
+# failures, and the wait gives up once errors have persisted this long.
+_ERROR_BACKOFF_BASE_S = 0.5
+_RESET_CLIENT_EVERY = 5
+_ERROR_WINDOW_SECONDS = 600
+
+# While the CLI prompt is open, how often to check the pending file for a
+# decision written by something other than the terminal.
+_PROMPT_POLL_SECONDS = 0.25
+
+
+def _request_hash(request: dict) -> str:
+    """Identity of an approval request: what is asked, not how it's explained."""
+    key = {k: request.get(k) for k in ("action_type", "action_input", "counter_offer")}
+    data = json.dumps(key, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
 
 class ApprovalTool:
     """Handles human-in-the-loop approval requests."""
@@ -23,6 +71,8 @@ class ApprovalTool:
 
     def __init__(self, output_dir: Optional[Path] = None):
         self.output_dir = output_dir or Path(".tmp")
+        # campaign_id -> (st_mtime_ns, st_size, status) of the pending file
+        self._status_cache: dict[str, tuple[int, int, str]] = {}
 
     def request_approval(
         self,
@@ -31,31 +81,49 @@ class ApprovalTool:
         approve_all: bool = False,
     ) -> ToolResult:
         """Request human approval for an action. Writes to file and optionally prompts CLI."""
-        request_id = f"{context.campaign_id}_{action.type}_{len(context.approval_queue)}"
+        campaign_id = context.campaign_id
+        request_id = f"{campaign_id}_{action.type}_{len(context.approval_queue)}"
         action_input = action.input or {}
+        approval_type = action_input.get("approval_type", "general")
         request = {
             "request_id": request_id,
-            "campaign_id": context.campaign_id,
-            "action_type": str(action.type) if hasattr(action.type, "value") else action.type,
+            "campaign_id": campaign_id,
+            "action_type": action.type.value if isinstance(action.type, Enum) else str(action.type),
             "action_input": action_input,
             "reasoning": action.reasoning,
             "status": "pending",
         }
 
         # For terms approval, include counter_offer details for review
-        if action_input.get("approval_type") == "terms":
+        terms_summary = None
+        if approval_type == "terms":
             counter = action_input.get("counter_offer") or context.pending_counter_offer or {}
             request["counter_offer"] = counter
             terms = counter.get("proposed_terms", {})
-            request["terms_summary"] = {
+            terms_summary = request["terms_summary"] = {
                 "fee_gbp": terms.get("fee_gbp"),
                 "deliverables": terms.get("deliverables"),
                 "deadline": terms.get("deadline"),
             }
 
-        path = self.output_dir / f"pending_approval_{context.campaign_id}.json"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(request, indent=2))
+        # Agents re-issue the same request after retries. If the file still
+        # holds this exact request undecided, keep its request_id and file
+        # instead of rewriting it. A decided file is never reused: action_input
+        # is the same for every strategy/creators/outreach request, so an
+        # earlier approval says nothing about the content under review now.
+        request["hash"] = _request_hash(request)
+        path = self.output_dir / f"pending_approval_{campaign_id}.json"
+        existing = self._read_request(path)
+        reuse_pending = (
+            existing.get("hash") == request["hash"] and existing.get("status") == "pending"
+        )
+        if reuse_pending:
+            request_id = existing.get("request_id", request_id)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Written for a person to review, so it stays indented. Replaced
+            # atomically so check_approval_status never reads a partial file.
+            write_json_atomic(path, request, indent=2)
 
         if approve_all:
             return ToolResult(
@@ -64,18 +132,28 @@ class ApprovalTool:
             )
 
         # Interactive prompt
-        approval_type = action_input.get("approval_type", "general")
-        print(f"\n--- Approval Required ({approval_type}) ---")
-        if approval_type == "terms" and request.get("terms_summary"):
-            ts = request["terms_summary"]
-            print(f"  Fee: £{ts.get('fee_gbp', 'N/A')}")
-            print(f"  Deliverables: {ts.get('deliverables', [])}")
-            print(f"  Deadline: {ts.get('deadline', 'N/A')}")
+        lines = [f"\n--- Approval Required ({approval_type}) ---"]
+        if terms_summary:
+            lines.append(f"  Fee: £{terms_summary.get('fee_gbp', 'N/A')}")
+            lines.append(f"  Deliverables: {terms_summary.get('deliverables', [])}")
+            lines.append(f"  Deadline: {terms_summary.get('deadline', 'N/A')}")
         if action.reasoning:
-            print(f"Reasoning: {action.reasoning}")
-        print("Details written to:", path)
-        response = input("Approve? [y/n/modify]: ").strip().lower()
-
+            lines.append(f"Reasoning: {action.reasoning}")
+        lines.append(f"Details written to: {path}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        response = self._prompt_decision("Approve? [y/n/modify]: ", campaign_id)
+
+        if response is None:
+            # Decided by editing the pending file instead of at the prompt
+            data = json.loads(path.read_bytes())
+            return ToolResult(
+                success=True,
+                output={
+                    "approval_granted": data.get("status") == "approved",
+                    "feedback": data.get("feedback"),
+                    "request_id": request_id,
+                },
+            )
         if response in ("y", "yes"):
             return ToolResult(
                 success=True,
@@ -97,13 +175,53 @@ class ApprovalTool:
                 },
             )
 
+    @staticmethod
+    def _read_request(path: Path) -> dict:
+        try:
+            return json.loads(path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _prompt_decision(self, prompt: str, campaign_id: str) -> Optional[str]:
+        """Read an answer from the terminal, or return None once the pending
+        file's status is set to approved/rejected by someone else.
+
+        Only a POSIX terminal is watched this way; piped stdin and Windows
+        consoles fall back to a plain input().
+        """
+        if os.name == "nt" or not sys.stdin.isatty():
+            return input(prompt).strip().lower()
+        print(prompt, end="", flush=True)
+        while True:
+            ready, _, _ = select.select([sys.stdin], [], [], _PROMPT_POLL_SECONDS)
+            if ready:
+                line = sys.stdin.readline()
+                if not line:
+                    raise EOFError
+                return line.strip().lower()
+            if self.check_approval_status("", campaign_id) in ("approved", "rejected"):
+                print()
+                return None
+
     def check_approval_status(self, request_id: str, campaign_id: str) -> str:
         """Read approval response from file. Returns 'approved', 'rejected', or 'pending'."""
         path = self.output_dir / f"pending_approval_{campaign_id}.json"
-        if not path.exists():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             return "pending"
-        data = json.loads(path.read_text())
-        return data.get("status", "pending")
+        # Polled repeatedly from the CLI; only re-parse when the file changes.
+        cached = self._status_cache.get(campaign_id)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        try:
+            status = json.loads(path.read_bytes()).get("status", "pending")
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Editors and scripts may rewrite the file in place; an empty or
+            # half-written file reads as pending and is re-read next poll.
+            return "pending"
+        self._status_cache[campaign_id] = (st.st_mtime_ns, st.st_size, status)
+        return status
 
     def execute(
         self,
@@ -120,9 +238,10 @@ class WebApprovalTool(ApprovalTool):
 
     action_type = "request_approval"
 
-    def __init__(self, campaign_db_id: str):
+    def __init__(self, campaign_db_id: str, max_wait_seconds: float = DEFAULT_APPROVAL_MAX_WAIT_SECONDS):
         super().__init__()
         self.campaign_db_id = campaign_db_id
+        self.max_wait_seconds = max_wait_seconds
 
     def _build_payload(self, context: CampaignContext, approval_type: str) -> dict:
         """Build structured payload from context for the frontend renderers."""
@@ -148,9 +267,7 @@ class WebApprovalTool(ApprovalTool):
         action: AgentAction,
         approve_all: bool = False,
     ) -> ToolResult:
-        """Create approval in Supabase and poll until decided."""
-        import time
-
+        """Create approval in Supabase and wait until decided."""
         if approve_all:
             return ToolResult(
                 success=True,
@@ -162,16 +279,14 @@ class WebApprovalTool(ApprovalTool):
         subject = action_input.get("subject", f"{approval_type.replace('_', ' ').title()} approval")
         payload = self._build_payload(context, approval_type)
 
-        # Create approval in Supabase
-        from backend.db.repositories.approval_repo import create_approval, get_approval
-        from backend.db.repositories.campaign_repo import update_campaign
-
-        approval_id = create_approval(
+        # Create approval in Supabase and mark the campaign as waiting on it
+        approval_id = create_approval_and_mark_waiting(
             campaign_id=self.campaign_db_id,
             approval_type=approval_type,
             payload=payload,
             subject=subject,
             reasoning=action.reasoning,
+            agent_state=context.state.value,
         )
 
         if not approval_id:
@@ -203,18 +318,24 @@ class WebApprovalTool(ApprovalTool):
                 self.campaign_db_id, e,
             )
 
-        # Update campaign status
-        update_campaign(self.campaign_db_id, {
-            "status": "awaiting_approval",
-            "agent_state": context.state.value,
-        })
-
-        # Poll for decision (with retry on transient connection errors)
+        # Register before the first read so a decision can't slip in between.
+        decided = decision_event(approval_id)
+        try:
+            return self._wait_for_decision(approval_id, decided)
+        finally:
+            discard_decision_event(approval_id)
+
+    def _wait_for_decision(self, approval_id: str, decided) -> ToolResult:
+        """Read the approval until it's decided, waking early on in-process decisions."""
+        deadline = time.monotonic() + self.max_wait_seconds
+        # Retry on transient connection errors
         consecutive_errors = 0
+        errors_since = None  # monotonic time of the first error in the current streak
         while True:
             try:
                 row = get_approval(approval_id)
                 consecutive_errors = 0  # Reset on success
+                errors_since = None
                 if row and row["status"] != "pending":
                     granted = row["status"] == "approved"
                     # Update campaign status back to running
@@ -230,28 +351,56 @@ class WebApprovalTool(ApprovalTool):
                     )
             except Exception as e:
                 consecutive_errors += 1
+                now = time.monotonic()
+                if errors_since is None:
+                    errors_since = now
                 logger.warning(
-                    "approval: polling get_approval(%s) failed (%d/20): %s",
+                    "approval: polling get_approval(%s) failed (%d in a row): %s",
                     approval_id, consecutive_errors, e,
                 )
-                if consecutive_errors > 20:
+                if now - errors_since > _ERROR_WINDOW_SECONDS:
                     return ToolResult(
                         success=False,
                         error="Lost connection to database after multiple retries",
                     )
-                # Reset Supabase client to get a fresh connection
-                try:
-                    from backend.db.client import reset_supabase
-                    reset_supabase()
-                except Exception as reset_err:
-                    logger.warning(
-                        "approval: failed to reset Supabase client: %s",
-                        reset_err,
-                    )
-                # Back off on errors
-                time.sleep(min(5 * consecutive_errors, 30))
+                # Reset Supabase client to get a fresh connection — but not on
+                # every error, so a blip doesn't make every waiter reconnect.
+                if consecutive_errors % _RESET_CLIENT_EVERY == 0:
+                    try:
+                        reset_supabase()
+                    except Exception as reset_err:
+                        logger.warning(
+                            "approval: failed to reset Supabase client: %s",
+                            reset_err,
+                        )
+                delay = _ERROR_BACKOFF_BASE_S * 2 ** min(consecutive_errors, 5)
+                time.sleep(delay + random.uniform(0, 0.5))
                 continue
-            time.sleep(3)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    "approval: %s undecided after %ds, giving up",
+                    approval_id, self.max_wait_seconds,
+                )
+                # Closed as rejected (a status the API and UI know) so it leaves
+                # the pending list; the worker moves the campaign out of
+                # awaiting_approval once the agent loop stops on timed_out.
+                feedback = f"Timed out: no decision within {self.max_wait_seconds / 3600:g}h"
+                try:
+                    decide_approval(approval_id, "rejected", feedback)
+                except Exception as e:
+                    logger.warning("approval: failed to close timed-out %s: %s", approval_id, e)
+                return ToolResult(
+                    success=True,
+                    output={
+                        "approval_granted": False,
+                        "timed_out": True,
+                        "feedback": feedback,
+                        "request_id": approval_id,
+                    },
+                )
+            decided.wait(min(FALLBACK_POLL_SECONDS, remaining))
+            decided.clear()
 
     def execute(
         self,
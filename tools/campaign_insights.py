@@ -12,9 +12,16 @@ Two-stage approach:
   2. Campaign: Purchase Intent + Comments Relevance (this tool)
 """
 
+import hashlib
 import json
 import logging
+import os
+import sqlite3
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -25,12 +32,92 @@ from dotenv import load_dotenv
 
 from models.actions import AgentAction, ToolResult
 from models.context import CampaignContext
+from services.json_utils import dumps, write_json_atomic
 from tools.base import BaseTool
 
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent InsightIQ content fetches / post analyses. Each analysis
+# holds a connection while it polls, so stay under the client's pool of 16.
+_ANALYSIS_CONCURRENCY = 8
+
+# Per-post wait for the InsightIQ comment analyses
+_ANALYSIS_MAX_WAIT = 45
+
+# Posts with fewer comments than this aren't worth two InsightIQ jobs.
+MIN_COMMENTS = 5
+
+# Finished post analyses are cached in output_dir for a week, so a rerun or
+# retry of the same campaign doesn't repeat two InsightIQ jobs per post.
+# Connections are per thread (analyses run on a pool) and per db path.
+_CACHE_DB = "insights_cache.sqlite"
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key        TEXT PRIMARY KEY,
+    json       TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+)
+"""
+_local = threading.local()
+
+
+def _cache_db(output_dir: Path) -> sqlite3.Connection:
+    conns: dict[Path, sqlite3.Connection] = getattr(_local, "conns", None) or {}
+    _local.conns = conns
+    conn = conns.get(output_dir)
+    if conn is None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(output_dir / _CACHE_DB, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_CACHE_SCHEMA)
+        conns[output_dir] = conn
+    return conn
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _analysis_key(content_id: str, product_name: str, product_description: str) -> str:
+    # Case and whitespace differences in the product text shouldn't miss.
+    raw = f"{content_id}|{_norm(product_name)}|{_norm(product_description)}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _without_raw(analysis: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    if not analysis:
+        return analysis
+    return {k: v for k, v in analysis.items() if k != "raw"}
+
+
+def _read_journal(path: Path, product_name: str, product_description: str) -> dict[str, dict[str, Any]]:
+    """content_id -> result from an unfinished run's journal (empty if none).
+
+    Lines for a different product or older than the cache TTL are ignored,
+    as are lines from before entries carried a key.
+    """
+    done: dict[str, dict[str, Any]] = {}
+    oldest = int(time.time()) - _CACHE_TTL_SECONDS
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn final line from the crash
+                result = entry.get("result")
+                if not result or (entry.get("written_at") or 0) < oldest:
+                    continue
+                content_id = result["content_id"]
+                if entry.get("key") == _analysis_key(content_id, product_name, product_description):
+                    done[content_id] = result
+    except FileNotFoundError:
+        pass
+    return done
+
 
 class CampaignInsightsTool(BaseTool):
     """Analyze campaign posts for Purchase Intent and Comments Relevance.
@@ -42,8 +129,11 @@ class CampaignInsightsTool(BaseTool):
 
     action_type = "campaign_insights"
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, keep_raw: bool = False):
         self.output_dir = output_dir or Path(".tmp")
+        # Keep full InsightIQ responses under "raw" (debugging only; they
+        # dwarf the derived fields and nothing downstream reads them).
+        self.keep_raw = keep_raw
         self._phyllo = None
 
     def _get_phyllo(self):
@@ -57,6 +147,7 @@ class CampaignInsightsTool(BaseTool):
         content_id: str,
         product_name: str,
         product_description: str = "",
+        keep_raw: bool = False,
     ) -> dict[str, Any]:
         """Run both Purchase Intent and Comments Relevance on a single post.
 
@@ -64,10 +155,18 @@ class CampaignInsightsTool(BaseTool):
             content_id: InsightIQ content/post ID
             product_name: Product or brand name being promoted
             product_description: Additional description for context
+            keep_raw: Include the full InsightIQ responses under "raw"
 
         Returns:
             Dict with purchase_intent and comments_relevance results.
         """
+        key = _analysis_key(content_id, product_name, product_description)
+        # The cache holds results without "raw", so it can't serve keep_raw.
+        cached = None if keep_raw else self._cache_get(key)
+        if cached is not None:
+            cached["product_name"] = product_name
+            return cached
+
         phyllo = self._get_phyllo()
         result: dict[str, Any] = {
             "content_id": content_id,
@@ -76,14 +175,22 @@ class CampaignInsightsTool(BaseTool):
             "comments_relevance": None,
         }
 
+        # Submit both jobs up front so InsightIQ runs them side by side; the
+        # waits below then share one 45s budget instead of 45s each.
+        pi_job = cr_job = None
+        try:
+            pi_job = phyllo.create_purchase_intent(content_id, product_name, product_description)
+        except Exception as e:
+            logger.warning("Purchase intent failed for %s: %s", content_id, e)
+        try:
+            cr_job = phyllo.create_comments_relevance(content_id, product_name, product_description)
+        except Exception as e:
+            logger.warning("Comments relevance failed for %s: %s", content_id, e)
+        deadline = time.monotonic() + _ANALYSIS_MAX_WAIT
+
         # Purchase Intent
         try:
-            pi = phyllo.analyze_purchase_intent(
-                content_id=content_id,
-                product_name=product_name,
-                product_description=product_description,
-                max_wait=45,
-            )
+            pi = phyllo.wait_purchase_intent(pi_job, max_wait=_ANALYSIS_MAX_WAIT)
             if pi:
                 result["purchase_intent"] = {
                     "score": pi.get("purchase_intent_score") or pi.get("score"),
@@ -97,14 +204,10 @@ class CampaignInsightsTool(BaseTool):
         except Exception as e:
             logger.warning("Purchase intent failed for %s: %s", content_id, e)
 
-        # Comments Relevance
+        # Comments Relevance — its job has been running during the wait above
         try:
-            cr = phyllo.analyze_comments_relevance(
-                content_id=content_id,
-                product_name=product_name,
-                product_description=product_description,
-                max_wait=45,
-            )
+            remaining = max(deadline - time.monotonic(), 1)
+            cr = phyllo.wait_comments_relevance(cr_job, max_wait=remaining)
             if cr:
                 result["comments_relevance"] = {
                     "relevant_count": cr.get("relevant_count") or cr.get("relevant_comments_count"),
@@ -118,7 +221,35 @@ class CampaignInsightsTool(BaseTool):
         except Exception as e:
             logger.warning("Comments relevance failed for %s: %s", content_id, e)
 
-        return result
+        stripped = {
+            **result,
+            "purchase_intent": _without_raw(result["purchase_intent"]),
+            "comments_relevance": _without_raw(result["comments_relevance"]),
+        }
+        # Partial results are left uncached so a failed half is retried.
+        if result["purchase_intent"] and result["comments_relevance"]:
+            self._cache_put(key, stripped)
+        return result if keep_raw else stripped
+
+    def _cache_get(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            row = _cache_db(self.output_dir).execute(
+                "SELECT json FROM kv WHERE key = ? AND created_at > ?",
+                (key, int(time.time()) - _CACHE_TTL_SECONDS),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Insights cache read failed: %s", e)
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _cache_put(self, key: str, result: dict[str, Any]) -> None:
+        try:
+            _cache_db(self.output_dir).execute(
+                "INSERT OR REPLACE INTO kv (key, json, created_at) VALUES (?, ?, ?)",
+                (key, dumps(result), int(time.time())),
+            )
+        except sqlite3.Error as e:
+            logger.warning("Insights cache write failed: %s", e)
 
     def analyze_campaign_posts(
         self,
@@ -148,66 +279,87 @@ class CampaignInsightsTool(BaseTool):
             logger.info("InsightIQ sandbox — skipping campaign insights")
             return []
 
-        all_results: list[dict[str, Any]] = []
-
-        # Try to get content IDs from monitoring data or fetch fresh
-        for creator in context.creators[:10]:
-            ext_id = creator.external_id
-            if not ext_id:
-                continue
+        # Every fetch and analysis is an independent, mostly-waiting InsightIQ
+        # call, so both passes run on a thread pool. Output order matches the
+        # serial creator → post order.
+        creators = [c for c in context.creators[:10] if c.external_id]
+        if not creators:
+            return []
 
-            # Fetch recent content
-            posts = phyllo.get_creator_content(
-                creator_id=str(ext_id),
+        def _fetch(creator):
+            return phyllo.get_creator_content(
+                creator_id=str(creator.external_id),
                 platform=creator.platform,
                 limit=5,
             )
 
-            for post in posts[:3]:
-                content_id = post.get("id") or post.get("content_id") or post.get("external_id")
-                if not content_id:
-                    continue
-
-                result = self.analyze_post(
-                    content_id=str(content_id),
-                    product_name=product_name,
-                    product_description=product_description,
-                )
-                result["creator_username"] = creator.username
-                result["creator_id"] = creator.id
-                result["post_url"] = post.get("url") or post.get("link") or post.get("permalink")
-                result["post_metrics"] = {
-                    "likes": post.get("likes") or post.get("like_count") or 0,
-                    "comments": post.get("comments") or post.get("comment_count") or 0,
-                    "shares": post.get("shares") or post.get("share_count") or 0,
-                }
-                all_results.append(result)
-
-        return all_results
+        def _analyze(job):
+            creator, post, content_id = job
+            result = self.analyze_post(
+                content_id=str(content_id),
+                product_name=product_name,
+                product_description=product_description,
+                keep_raw=self.keep_raw,
+            )
+            result["creator_username"] = creator.username
+            result["creator_id"] = creator.id
+            result["post_url"] = post.get("url") or post.get("link") or post.get("permalink")
+            result["post_metrics"] = {
+                "likes": post.get("likes") or post.get("like_count") or 0,
+                "comments": post.get("comments") or post.get("comment_count") or 0,
+                "shares": post.get("shares") or post.get("share_count") or 0,
+            }
+            return result
+
+        # Each finished post is appended to a JSONL journal, so a run that
+        # dies part-way resumes from it instead of re-analysing every post.
+        # Lines carry the analysis key and write time so a rerun for other
+        # product text, or much later, starts fresh. The journal is removed
+        # once the run completes.
+        journal = self.output_dir / f"campaign_insights_{context.campaign_id}.jsonl"
+        done = _read_journal(journal, product_name, product_description)
+        if done:
+            logger.info("Resuming campaign insights: %d posts already analysed", len(done))
+
+        with ThreadPoolExecutor(max_workers=_ANALYSIS_CONCURRENCY) as pool:
+            jobs = []
+            for creator, posts in zip(creators, pool.map(_fetch, creators)):
+                for post in posts[:3]:
+                    content_id = post.get("id") or post.get("content_id") or post.get("external_id")
+                    if not content_id:
+                        continue
+                    # Only skip when the count is known; some payloads omit it.
+                    comments = post.get("comments")
+                    if comments is None:
+                        comments = post.get("comment_count")
+                    if isinstance(comments, int) and comments < MIN_COMMENTS:
+                        continue
+                    jobs.append((creator, post, content_id))
+
+            todo = [job for job in jobs if str(job[2]) not in done]
+            journal.parent.mkdir(parents=True, exist_ok=True)
+            with open(journal, "ab") as f:
+                for result in pool.map(_analyze, todo):
+                    f.write(dumps({
+                        "key": _analysis_key(result["content_id"], product_name, product_description),
+                        "written_at": int(time.time()),
+                        "result": result,
+                    }).encode() + b"\n")
+                    f.flush()
+                    done[result["content_id"]] = result
+
+        journal.unlink(missing_ok=True)
+        return [done[str(job[2])] for job in jobs]
 
     def _build_summary(self, results: list[dict[str, Any]]) -> dict[str, Any]:
         """Build aggregate summary from individual post analyses."""
-        summary: dict[str, Any] = {
-            "posts_analyzed": len(results),
-            "purchase_intent": {
-                "avg_score": None,
-                "total_intent_comments": 0,
-                "total_comments_analyzed": 0,
-                "by_creator": [],
-            },
-            "comments_relevance": {
-                "avg_relevance_pct": None,
-                "total_relevant": 0,
-                "total_analyzed": 0,
-                "sentiment": {"positive": 0, "neutral": 0, "negative": 0},
-                "by_creator": [],
-            },
-        }
-
-        pi_scores = []
-        cr_pcts = []
-        creator_pi: dict[str, list] = {}
-        creator_cr: dict[str, list] = {}
+        # Single pass with running totals; per-creator entries are [sum, count].
+        pi_sum = cr_sum = 0.0
+        pi_n = cr_n = 0
+        intent_comments = pi_analyzed = relevant = cr_analyzed = 0
+        positive = neutral = negative = 0
+        creator_pi: dict[str, list] = defaultdict(lambda: [0.0, 0])
+        creator_cr: dict[str, list] = defaultdict(lambda: [0.0, 0])
 
         for r in results:
             uname = r.get("creator_username", "unknown")
@@ -217,47 +369,57 @@ class CampaignInsightsTool(BaseTool):
             if pi:
                 score = pi.get("score")
                 if score is not None:
-                    pi_scores.append(float(score))
-                    creator_pi.setdefault(uname, []).append(float(score))
-                summary["purchase_intent"]["total_intent_comments"] += int(pi.get("intent_count") or 0)
-                summary["purchase_intent"]["total_comments_analyzed"] += int(pi.get("total_comments") or 0)
+                    score = float(score)
+                    pi_sum += score
+                    pi_n += 1
+                    acc = creator_pi[uname]
+                    acc[0] += score
+                    acc[1] += 1
+                intent_comments += int(pi.get("intent_count") or 0)
+                pi_analyzed += int(pi.get("total_comments") or 0)
 
             # Comments Relevance aggregation
             cr = r.get("comments_relevance")
             if cr:
                 pct = cr.get("relevance_percentage")
                 if pct is not None:
-                    cr_pcts.append(float(pct))
-                    creator_cr.setdefault(uname, []).append(float(pct))
-                summary["comments_relevance"]["total_relevant"] += int(cr.get("relevant_count") or 0)
-                summary["comments_relevance"]["total_analyzed"] += int(cr.get("total_comments") or 0)
+                    pct = float(pct)
+                    cr_sum += pct
+                    cr_n += 1
+                    acc = creator_cr[uname]
+                    acc[0] += pct
+                    acc[1] += 1
+                relevant += int(cr.get("relevant_count") or 0)
+                cr_analyzed += int(cr.get("total_comments") or 0)
 
                 # Sentiment
                 sentiment = cr.get("sentiment_breakdown") or {}
-                for key in ("positive", "neutral", "negative"):
-                    summary["comments_relevance"]["sentiment"][key] += int(sentiment.get(key, 0))
-
-        # Averages
-        if pi_scores:
-            summary["purchase_intent"]["avg_score"] = round(sum(pi_scores) / len(pi_scores), 1)
-        if cr_pcts:
-            summary["comments_relevance"]["avg_relevance_pct"] = round(sum(cr_pcts) / len(cr_pcts), 1)
-
-        # Per-creator summaries
-        for uname, scores in creator_pi.items():
-            summary["purchase_intent"]["by_creator"].append({
-                "username": uname,
-                "avg_score": round(sum(scores) / len(scores), 1),
-                "posts": len(scores),
-            })
-        for uname, pcts in creator_cr.items():
-            summary["comments_relevance"]["by_creator"].append({
-                "username": uname,
-                "avg_relevance_pct": round(sum(pcts) / len(pcts), 1),
-                "posts": len(pcts),
-            })
-
-        return summary
+                positive += int(sentiment.get("positive", 0))
+                neutral += int(sentiment.get("neutral", 0))
+                negative += int(sentiment.get("negative", 0))
+
+        return {
+            "posts_analyzed": len(results),
+            "purchase_intent": {
+                "avg_score": round(pi_sum / pi_n, 1) if pi_n else None,
+                "total_intent_comments": intent_comments,
+                "total_comments_analyzed": pi_analyzed,
+                "by_creator": [
+                    {"username": uname, "avg_score": round(total / n, 1), "posts": n}
+                    for uname, (total, n) in creator_pi.items()
+                ],
+            },
+            "comments_relevance": {
+                "avg_relevance_pct": round(cr_sum / cr_n, 1) if cr_n else None,
+                "total_relevant": relevant,
+                "total_analyzed": cr_analyzed,
+                "sentiment": {"positive": positive, "neutral": neutral, "negative": negative},
+                "by_creator": [
+                    {"username": uname, "avg_relevance_pct": round(total / n, 1), "posts": n}
+                    for uname, (total, n) in creator_cr.items()
+                ],
+            },
+        }
 
     def execute(
         self,
@@ -289,12 +451,17 @@ class CampaignInsightsTool(BaseTool):
             # Persist results to JSON file (for analytics tool)
             path = self.output_dir / f"campaign_insights_{context.campaign_id}.json"
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(json.dumps({
+            # Compact + atomic: the posts carry raw InsightIQ payloads, and the
+            # analytics tool must never read a half-written file.
+            # HUDEY_PRETTY_JSON=1 for debugging.
+            pretty = os.getenv("HUDEY_PRETTY_JSON") == "1"
+            report = {
                 "campaign_id": context.campaign_id,
                 "analyzed_at": datetime.now().isoformat(),
                 "summary": summary,
                 "posts": results,
-            }, indent=2, default=str))
+            }
+            write_json_atomic(path, report, indent=2 if pretty else None)
 
             # Persist to campaign_insights DB table (durable storage)
             db_ids = []
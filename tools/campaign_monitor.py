@@ -15,8 +15,9 @@ import random
 import re
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -26,6 +27,16 @@ from tools.base import BaseTool
 
 logger = logging.getLogger(__name__)
 
+_HASHTAG_RE = re.compile(r"#\w+")
+# Hashtags and mentions in one pass; \w never matches "#" or "@", so this
+# yields the same tokens as separate #\w+ and @\w+ scans.
+_TAG_OR_MENTION_RE = re.compile(r"[#@]\w+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+_NON_HANDLE_RE = re.compile(r"[^a-z0-9_]")
+
+# Any one of these satisfies the ad-disclosure requirement.
+_DISCLOSURE_TAGS = frozenset({"#ad", "#sponsored", "#partnership", "#paidpartnership", "#gifted"})
+
 
 # ── Compliance helpers ──────────────────────────────────────────
 
@@ -36,51 +47,60 @@ def _extract_required_hashtags(context: CampaignContext) -> list:
     Looks at key_message, deliverables, and brand_name to build a list of
     hashtags that should appear in creator posts.
     """
-    tags = []
     if not context.brief:
-        return tags
+        return []
+    return list(_required_hashtags(context.brief.brand_name, context.brief.key_message))
+
+
+def _extract_required_mentions(context: CampaignContext) -> list:
+    """Extract required @mentions from the campaign brief."""
+    if not context.brief:
+        return []
+    return list(_required_mentions(context.brief.brand_name))
+
 
+# The brief is fixed for a campaign but the monitor runs repeatedly, so the
+# extraction is memoized on the brief fields it reads.
+@lru_cache(maxsize=64)
+def _required_hashtags(brand: Optional[str], key_message: Optional[str]) -> tuple:
     # Always require disclosure hashtags
-    tags.extend(["#ad", "#sponsored", "#partnership"])
+    tags = ["#ad", "#sponsored", "#partnership"]
 
     # Brand hashtag (lowercase, no spaces)
-    brand = context.brief.brand_name
     if brand:
-        tag = "#" + re.sub(r"[^a-z0-9]", "", brand.lower())
+        tag = "#" + _NON_ALNUM_RE.sub("", brand.lower())
         if tag != "#":
             tags.append(tag)
 
     # Extract hashtags from key_message
-    if context.brief.key_message:
-        found = re.findall(r"#\w+", context.brief.key_message.lower())
-        tags.extend(found)
+    if key_message:
+        tags.extend(_HASHTAG_RE.findall(key_message.lower()))
 
-    return list(set(tags))
+    return tuple(set(tags))
 
 
-def _extract_required_mentions(context: CampaignContext) -> list:
-    """Extract required @mentions from the campaign brief."""
-    mentions = []
-    if not context.brief:
-        return mentions
-
-    brand = context.brief.brand_name
+@lru_cache(maxsize=64)
+def _required_mentions(brand: Optional[str]) -> tuple:
     if brand:
-        mention = "@" + re.sub(r"[^a-z0-9_]", "", brand.lower())
+        mention = "@" + _NON_HANDLE_RE.sub("", brand.lower())
         if mention != "@":
-            mentions.append(mention)
-
-    return mentions
+            return (mention,)
+    return ()
 
 
 def _check_compliance(
     post: dict,
-    required_hashtags: list,
-    required_mentions: list,
+    required_hashtags: Iterable[str],
+    required_mentions: Iterable[str],
     deliverables: list,
+    brand_tags: Optional[frozenset] = None,
 ) -> dict:
     """Check a post for compliance with campaign requirements.
 
+    Callers checking many posts for one campaign should pass frozensets
+    (and brand_tags, the required hashtags minus disclosure tags) so they
+    are built once rather than per post.
+
     Returns:
         {
             "hashtags_found": [...],
@@ -97,24 +117,33 @@ def _check_compliance(
     caption = (
         post.get("caption") or post.get("description") or post.get("text") or ""
     ).lower()
-    post_hashtags = set(re.findall(r"#\w+", caption))
-    post_mentions = set(re.findall(r"@\w+", caption))
+    # Required hashtags start with "#" and mentions with "@", so one token
+    # set serves both lookups. The substring checks skip the regex pass on
+    # captions with no tokens at all.
+    if "#" in caption or "@" in caption:
+        post_hashtags = post_mentions = set(_TAG_OR_MENTION_RE.findall(caption))
+    else:
+        post_hashtags = post_mentions = set()
+
+    if not isinstance(required_hashtags, frozenset):
+        required_hashtags = frozenset(required_hashtags)
+    if not isinstance(required_mentions, frozenset):
+        required_mentions = frozenset(required_mentions)
+    if brand_tags is None:
+        brand_tags = required_hashtags - _DISCLOSURE_TAGS
 
     # Hashtag compliance — at least one disclosure tag present
-    disclosure_tags = {"#ad", "#sponsored", "#partnership", "#paidpartnership", "#gifted"}
-    has_disclosure = bool(post_hashtags & disclosure_tags)
-    brand_tags = [t for t in required_hashtags if t not in disclosure_tags]
-    brand_tags_found = [t for t in brand_tags if t in post_hashtags]
-    brand_tags_missing = [t for t in brand_tags if t not in post_hashtags]
-
-    hashtags_found = list(post_hashtags & set(required_hashtags))
-    hashtags_missing = [t for t in required_hashtags if t not in post_hashtags]
+    has_disclosure = not post_hashtags.isdisjoint(_DISCLOSURE_TAGS)
+    brand_tags_missing = list(brand_tags - post_hashtags)
+
+    hashtags_found = list(required_hashtags & post_hashtags)
+    hashtags_missing = list(required_hashtags - post_hashtags)
     # OK if has disclosure + brand tag (if any brand tags exist)
-    hashtags_ok = has_disclosure and (len(brand_tags) == 0 or len(brand_tags_found) > 0)
+    hashtags_ok = has_disclosure and (not brand_tags or len(brand_tags_missing) < len(brand_tags))
 
     # Mention compliance
-    mentions_found = [m for m in required_mentions if m in post_mentions]
-    mentions_missing = [m for m in required_mentions if m not in post_mentions]
+    mentions_found = list(required_mentions & post_mentions)
+    mentions_missing = list(required_mentions - post_mentions)
     mentions_ok = len(mentions_missing) == 0
 
     # Deliverables check (basic heuristic — hard to verify from content alone)
@@ -152,16 +181,18 @@ def _map_phyllo_content_to_update(
     creator_dict: dict,
     post: dict,
     platform: str,
-    required_hashtags: Optional[list] = None,
-    required_mentions: Optional[list] = None,
+    required_hashtags: Optional[frozenset] = None,
+    required_mentions: Optional[frozenset] = None,
     deliverables: Optional[list] = None,
+    brand_tags: Optional[frozenset] = None,
 ) -> dict:
     """Map Phyllo content/engagement item to monitor_updates structure."""
     compliance = _check_compliance(
         post,
-        required_hashtags or [],
-        required_mentions or [],
+        required_hashtags or frozenset(),
+        required_mentions or frozenset(),
         deliverables or [],
+        brand_tags,
     )
 
     return {
@@ -209,39 +240,40 @@ def build_monitor_summary(updates: list) -> dict:
             "fully_compliant": int,
         }
     """
-    total_creators = len({
-        (u.get("creator") or {}).get("username", i)
-        for i, u in enumerate(updates)
-    })
-    posted = [u for u in updates if u.get("posted")]
-    posts_live = len(posted)
-    totals = {"likes": 0, "comments": 0, "shares": 0, "saves": 0}
-    compliance_scores = []
+    # One pass with local accumulators; only posted updates count towards
+    # metrics and compliance.
+    creators = set()
+    posts_live = likes = comments = shares = saves = 0
+    score_sum = 0.0
     compliance_issues_count = 0
     fully_compliant = 0
 
-    for u in posted:
+    for i, u in enumerate(updates):
+        creators.add((u.get("creator") or {}).get("username", i))
+        if not u.get("posted"):
+            continue
+        posts_live += 1
         m = u.get("metrics", {})
-        for k in totals:
-            totals[k] += m.get(k, 0)
+        likes += m.get("likes", 0)
+        comments += m.get("comments", 0)
+        shares += m.get("shares", 0)
+        saves += m.get("saves", 0)
         c = u.get("compliance", {})
-        score = c.get("compliance_score", 0)
-        compliance_scores.append(score)
-        issues = c.get("issues", [])
-        if issues:
+        score_sum += c.get("compliance_score", 0)
+        if c.get("issues"):
             compliance_issues_count += 1
         else:
             fully_compliant += 1
 
-    avg_score = round(sum(compliance_scores) / max(len(compliance_scores), 1), 1) if compliance_scores else 0
+    avg_score = round(score_sum / posts_live, 1) if posts_live else 0
 
     return {
-        "total_creators": total_creators,
+        "total_creators": len(creators),
         "posts_live": posts_live,
-        "total_likes": totals["likes"],
-        "total_comments": totals["comments"],
-        "total_shares": totals["shares"],
-        "total_saves": totals["saves"],
+        "total_likes": likes,
+        "total_comments": comments,
+        "total_shares": shares,
+        "total_saves": saves,
         "avg_compliance_score": avg_score,
         "compliance_issues": compliance_issues_count,
         "fully_compliant": fully_compliant,
@@ -284,8 +316,9 @@ class CampaignMonitorTool(BaseTool):
         if "sandbox" in phyllo.base_url:
             return None
 
-        required_hashtags = _extract_required_hashtags(context)
-        required_mentions = _extract_required_mentions(context)
+        required_hashtags = frozenset(_extract_required_hashtags(context))
+        required_mentions = frozenset(_extract_required_mentions(context))
+        brand_tags = required_hashtags - _DISCLOSURE_TAGS
         deliverables = context.brief.deliverables if context.brief else []
 
         updates = []
@@ -335,6 +368,7 @@ class CampaignMonitorTool(BaseTool):
                             required_hashtags,
                             required_mentions,
                             deliverables,
+                            brand_tags,
                         )
                     )
             else:
@@ -348,7 +382,7 @@ class CampaignMonitorTool(BaseTool):
         base_time = datetime.now()
         brand_tag = ""
         if context.brief:
-            brand_tag = "#" + re.sub(r"[^a-z0-9]", "", context.brief.brand_name.lower())
+            brand_tag = "#" + _NON_ALNUM_RE.sub("", context.brief.brand_name.lower())
 
         for creator in context.creators:
             posted = random.random() > 0.2
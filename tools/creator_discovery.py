@@ -276,6 +276,7 @@ class CreatorDiscoveryTool(BaseTool):
                 output={
                     "creators": [c.model_dump() for c in creators],
                     "creator_criteria": criteria.model_dump(),
+                    "_trusted": True,
                 },
             )
         except Exception as e:
@@ -217,6 +217,7 @@ class NegotiationTool(BaseTool):
             output={
                 "engagements": {k: v.model_dump() if hasattr(v, "model_dump") else v for k, v in engagements.items()},
                 "state": next_state,
+                "_trusted": True,
             },
         )
 
@@ -4,6 +4,7 @@ import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +16,7 @@ from dotenv import load_dotenv
 from models.actions import AgentAction, AgentActionType, ToolResult
 from models.campaign import Creator
 from models.context import CampaignContext
+from services.json_utils import write_json_atomic
 from tools.base import BaseTool
 from tools.email_template import render_email_html
 
@@ -22,6 +24,9 @@ load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent draft LLM calls per batch
+_DRAFT_CONCURRENCY = 10
+
 
 OUTREACH_PROMPT = """Write a personalized outreach message for this creator.
 
@@ -95,61 +100,86 @@ class OutreachTool(BaseTool):
                     "creator_id": m.get("creator_id", ""),
                     "email": m.get("email", ""),
                 }
-        mapping_path.write_text(json.dumps(existing, indent=2))
+        # Compact + atomic: response_router re-reads this on every reply and
+        # must never see a half-written file. HUDEY_PRETTY_JSON=1 for debugging.
+        indent = 2 if os.getenv("HUDEY_PRETTY_JSON") == "1" else None
+        write_json_atomic(mapping_path, existing, indent=indent)
+
+    def _index_recipients(self, campaign_id: str, messages: list[dict]) -> None:
+        """Record recipient emails so replies without a message_id still route."""
+        try:
+            from services.response_router import record_outreach
+            record_outreach(self.output_dir, campaign_id, messages)
+        except Exception as e:
+            logger.warning("outreach: failed to index recipient emails: %s", e)
+
+    def _draft_one(
+        self,
+        creator: Creator,
+        context: CampaignContext,
+        client: Optional[Anthropic],
+    ) -> dict:
+        """Generate a single outreach draft (one LLM call when enabled)."""
+        prompt = OUTREACH_PROMPT.format(
+            username=creator.username,
+            display_name=creator.display_name or creator.username,
+            platform=creator.platform,
+            follower_count=creator.follower_count,
+            categories=", ".join(creator.categories or ["general"]),
+            brand_name=context.brief.brand_name,
+            objective=context.brief.objective,
+            key_message=context.brief.key_message,
+            deliverables=", ".join(context.brief.deliverables),
+            budget_gbp=context.brief.budget_gbp,
+        )
+
+        if client:
+            try:
+                msg = client.messages.create(
+                    model="claude-sonnet-4-5",
+                    max_tokens=512,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+                text = msg.content[0].text.strip()
+                if text.startswith("```"):
+                    lines = text.split("\n")
+                    text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+                data = json.loads(text)
+            except Exception:
+                data = {"subject": "Partnership opportunity", "body": "Hi, we'd love to collaborate..."}
+        else:
+            data = {
+                "subject": f"Partnership with {context.brief.brand_name}",
+                "body": f"Hi {creator.display_name or creator.username}, we're reaching out about a campaign.",
+            }
+
+        return {
+            "creator": creator.model_dump(),
+            "subject": data.get("subject", ""),
+            "body": data.get("body", ""),
+        }
 
     def draft_outreach_batch(
         self,
         creators: list[Creator],
         context: CampaignContext,
     ) -> list[dict]:
-        """Generate personalized outreach drafts for each creator."""
+        """Generate personalized outreach drafts for each creator.
+
+        Each draft is an independent LLM round-trip, so they run on a small
+        thread pool (capped to stay under Anthropic rate limits). Output order
+        matches ``creators``.
+        """
         if not context.brief or not context.strategy:
             return []
 
-        drafts = []
         client = self._get_client()
+        if not client or len(creators) <= 1:
+            return [self._draft_one(c, context, client) for c in creators]
 
-        for creator in creators:
-            prompt = OUTREACH_PROMPT.format(
-                username=creator.username,
-                display_name=creator.display_name or creator.username,
-                platform=creator.platform,
-                follower_count=creator.follower_count,
-                categories=", ".join(creator.categories or ["general"]),
-                brand_name=context.brief.brand_name,
-                objective=context.brief.objective,
-                key_message=context.brief.key_message,
-                deliverables=", ".join(context.brief.deliverables),
-                budget_gbp=context.brief.budget_gbp,
-            )
-
-            if client:
-                try:
-                    msg = client.messages.create(
-                        model="claude-sonnet-4-5",
-                        max_tokens=512,
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-                    text = msg.content[0].text.strip()
-                    if text.startswith("```"):
-                        lines = text.split("\n")
-                        text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-                    data = json.loads(text)
-                except Exception:
-                    data = {"subject": "Partnership opportunity", "body": "Hi, we'd love to collaborate..."}
-            else:
-                data = {
-                    "subject": f"Partnership with {context.brief.brand_name}",
-                    "body": f"Hi {creator.display_name or creator.username}, we're reaching out about a campaign.",
-                }
-
-            drafts.append({
-                "creator": creator.model_dump(),
-                "subject": data.get("subject", ""),
-                "body": data.get("body", ""),
-            })
-
-        return drafts
+        workers = min(_DRAFT_CONCURRENCY, len(creators))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda c: self._draft_one(c, context, client), creators))
 
     def _seed_engagements(self, campaign_id: str, drafts: list[dict], messages: list[dict]) -> None:
         """Seed initial 'contacted' engagements in Supabase for dashboard visibility."""
@@ -300,6 +330,7 @@ class OutreachTool(BaseTool):
 
         # Log to disk (backwards compat) and Supabase (for webhook lookups)
         self._log_message_ids(context.campaign_id, messages)
+        self._index_recipients(context.campaign_id, messages)
         self._log_email_events(context.campaign_id, messages)
         self._seed_engagements(context.campaign_id, drafts, messages)
 